@@ -11,8 +11,9 @@ def decode_sparsevol(b, format='rles'):
 
     Parameters
     ----------
-    b :         bytes
-                Data to decode.
+    b :         bytes | file-like
+                Data to decode. File-like objects (e.g. a streamed response)
+                are read incrementally.
     format :    "blocks" | "rles"
                 Binary format in which the file is encoded. Only "rles" is
                 supported at the moment.
@@ -23,26 +24,61 @@ def decode_sparsevol(b, format='rles'):
                 Please note that this function is agnostic to voxel size, etc.
 
     """
-    if not isinstance(b, bytes):
-        raise TypeError('Need bytes, got "{}"'.format(type(b)))
+    if isinstance(b, bytes):
+        read = _BytesReader(b).read
+    elif hasattr(b, 'read'):
+        read = b.read
+    else:
+        raise TypeError('Need bytes or file-like, got "{}"'.format(type(b)))
 
     if format == 'rles':
         # First get the header
         header = {k: v for k, v in zip(['start_byte', 'n_dims', 'run_dims',
                                         'reserved', 'n_blocks', 'n_spans'],
-                                        struct.unpack('bbbbii', b[:12]))}
-        coords = []
-        for i in range(header['n_spans']):
-            offset = 12 + (i * 16)
-            x, y, z, run_len = struct.unpack('iiii', b[offset: offset + 16])
+                                        struct.unpack('<bbbbii', _read_exactly(read, 12)))}
+
+        # Each span is encoded as x, y, z, run length
+        spans = np.frombuffer(_read_exactly(read, header['n_spans'] * 16),
+                              dtype='<i4').reshape(-1, 4).astype(np.int64)
 
-            this_run = np.repeat([[x, y, z]], run_len, axis=0)
-            this_run[:, 0] = np.arange(x, x + run_len)
+        # Expand runs along the x-axis
+        lengths = spans[:, 3]
+        coords = np.repeat(spans[:, :3], lengths, axis=0)
+        starts = np.repeat(np.cumsum(lengths) - lengths, lengths)
+        coords[:, 0] += np.arange(coords.shape[0]) - starts
 
-            coords.append(this_run)
-        coords = np.concatenate(coords)
         return header, coords
     elif format == 'blocks':
         raise ValueError('Format "blocks" not yet implemented.')
     else:
-        raise ValueError('Unknown format "{}"'.format(form))
\ No newline at end of file
+        raise ValueError('Unknown format "{}"'.format(format))
+
+
+class _BytesReader:
+    """ Minimal reader for bytes that does not copy the underlying data."""
+
+    def __init__(self, b):
+        self.view = memoryview(b)
+        self.offset = 0
+
+    def read(self, n):
+        chunk = self.view[self.offset: self.offset + n]
+        self.offset += len(chunk)
+        return chunk
+
+
+def _read_exactly(read, n):
+    """ Read exactly ``n`` bytes (streams may return fewer per read)."""
+    chunk = read(n)
+    if len(chunk) == n:
+        return chunk
+
+    buffer = bytearray(chunk)
+    while len(buffer) < n:
+        chunk = read(n - len(buffer))
+        if not chunk:
+            raise ValueError('Unexpected end of data: expected {} bytes, '
+                             'got {}'.format(n, len(buffer)))
+        buffer += chunk
+
+    return bytes(buffer)
@@ -6,41 +6,274 @@ from . import mesh
 from . import utils
 from . import config
 
+import copy
+import functools
+import hashlib
 import inspect
+import itertools
+import json
 import os
 import re
 import requests
+import shutil
+import tempfile
+import threading
+import time
 import warnings
 
 import numpy as np
 import pandas as pd
+import scipy.sparse
 
-from io import StringIO
+from collections import OrderedDict
+from io import BytesIO, StringIO
+from requests.adapters import HTTPAdapter
+from scipy.spatial import cKDTree
 from scipy.spatial.distance import cdist
-from tqdm import tqdm
+from urllib.parse import quote
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Extracts the mutation ID from SWC headers
+_MUT_ID_RE = re.compile('"mutation id": (.*?)}')
+
+
+def _make_session():
+    """ Generate session with connection pooling and retries."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=16,
+                          pool_maxsize=utils._MAX_THREADS,
+                          max_retries=Retry(total=3,
+                                            backoff_factor=0.3,
+                                            status_forcelist=[502, 503, 504]))
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+# Module-level session -> re-uses connections across calls
+_SESSION = _make_session()
+
+
+def set_session(session):
+    """ Set the ``requests.Session`` used to talk to the DVID server.
+
+    Use this to e.g. add authentication, custom headers or adapters.
+
+    Parameters
+    ----------
+    session :   requests.Session
+
+    """
+    global _SESSION
+
+    if not isinstance(session, requests.Session):
+        raise TypeError('Expected requests.Session, got "{}"'.format(type(session)))
+
+    _SESSION = session
+
+
+def _parse_json(r):
+    """ Decode JSON response. Uses the (much faster) orjson if available."""
+    if orjson:
+        return orjson.loads(r.content)
+    return r.json()
+
+
+def _get_positions(syn):
+    """ Extract (N, 3) array of positions from a list of synapses."""
+    return np.fromiter(itertools.chain.from_iterable(s['Pos'] for s in syn),
+                       dtype=np.int64,
+                       count=len(syn) * 3).reshape(-1, 3)
+
+
+def _format_records(records, return_type):
+    """ Convert list of records (dicts) to the requested ``return_type``.
+
+    "dataframe" returns a pandas.DataFrame, "records" returns the list as is
+    and "arrays" returns a dict of numpy arrays, one per column.
+    """
+    if return_type == 'records':
+        return records
+    elif return_type == 'dataframe':
+        return pd.DataFrame.from_records(records)
+    elif return_type != 'arrays':
+        raise ValueError('Unknown return_type "{}"'.format(return_type))
+
+    # Records may not all have the same keys (e.g. flattened properties)
+    keys = dict.fromkeys(k for r in records for k in r)
+
+    arrays = {}
+    for k in keys:
+        if k == 'Pos':
+            arrays[k] = _get_positions(records)
+            continue
+
+        col = [r.get(k) for r in records]
+        if isinstance(col[0], (dict, list)):
+            # Nested data (e.g. "Prop" or "Rels") -> keep as objects
+            arrays[k] = np.empty(len(col), dtype=object)
+            arrays[k][:] = col
+        else:
+            arrays[k] = np.asarray(col)
+
+    return arrays
+
+
+def _check_return_type(return_type):
+    """ Raise if ``return_type`` is not one of the allowed values."""
+    if return_type not in ('dataframe', 'records', 'arrays'):
+        raise ValueError('`return_type` must be "dataframe", "records" or '
+                         '"arrays", got "{}"'.format(return_type))
+
+
+# Settings for the on-disk cache of server responses
+_DISK_CACHE = {'path': os.path.expanduser('~/.cache/dvidtools'),
+               'enabled': False}
+
+
+def set_cache(path=None, enabled=True):
+    """ Configure on-disk cache for server responses.
+
+    If enabled, responses for data that does not change for a given node
+    (segmentation info, ROIs, skeletons and sparse volumes) are stored on disk
+    and re-used across Python sessions.
+
+    Important
+    ---------
+    Only enable this if you are working with locked (committed) nodes. Data
+    in open nodes can change, in which case the cache will return stale data!
+    The exception are skeletons fetched with ``check_mutation=True``: those
+    are cached per mutation ID of the body.
+
+    Parameters
+    ----------
+    path :      str, optional
+                Directory to use for the cache. Defaults to
+                ``~/.cache/dvidtools``.
+    enabled :   bool, optional
+                Whether to use the cache.
+
+    """
+    if path:
+        _DISK_CACHE['path'] = os.path.expanduser(path)
+    _DISK_CACHE['enabled'] = enabled
+
+
+def _make_url(endpoint, *args, server, node):
+    """ Build URL for given endpoint.
+
+    Arguments are URL-encoded and formatted into ``endpoint``. For example::
+
+        _make_url('{}/info', 'segmentation', server=server, node=node)
+
+    returns ``{server}/api/node/{node}/segmentation/info``.
+    """
+    args = [quote(str(a), safe='') for a in args]
+    return '{}/api/node/{}/{}'.format(server, node, endpoint.format(*args))
+
+
+def _cache_file(url):
+    """ Generate filename in the on-disk cache for given URL."""
+    return os.path.join(_DISK_CACHE['path'],
+                        hashlib.sha1(url.encode()).hexdigest())
+
+
+def _cached_get(url, use_cache=True, stream=False):
+    """ GET from server or - if enabled and available - the on-disk cache.
+
+    Parameters
+    ----------
+    url :       str
+    use_cache : bool
+                Whether to use the on-disk cache (if enabled).
+    stream :    bool
+                If True, the body can be read incrementally from ``r.raw``.
+
+    Returns
+    -------
+    requests.Response
+    """
+    use_cache = use_cache and _DISK_CACHE['enabled']
+
+    if use_cache:
+        fp = _cache_file(url)
+        if os.path.isfile(fp):
+            with open(fp, 'rb') as f:
+                r = requests.Response()
+                r._content = f.read()
+                r.status_code = 200
+                r.url = url
+                r.encoding = 'utf-8'
+            if stream:
+                r.raw = BytesIO(r._content)
+            return r
+
+    # No need to stream if we need the full content for the cache anyway
+    r = _SESSION.get(url, stream=stream and not use_cache)
+
+    # Only cache successful responses
+    if use_cache and r.status_code == 200:
+        _write_cache_file(fp, r.content)
+
+    if stream:
+        if use_cache:
+            r.raw = BytesIO(r.content)
+        else:
+            # Make sure compressed responses are decoded transparently
+            r.raw.decode_content = True
+
+    return r
+
+
+def _write_cache_file(fp, content):
+    """ Atomically write ``content`` (bytes) to file in the on-disk cache."""
+    os.makedirs(os.path.dirname(fp), exist_ok=True)
+    # Write to temporary file first so that we never leave half-written
+    # files in the cache
+    with tempfile.NamedTemporaryFile(dir=os.path.dirname(fp),
+                                     delete=False) as f:
+        f.write(content)
+    os.replace(f.name, fp)
+
+
+def _skeleton_cache_file(url, mutation_id):
+    """ Filename in the on-disk cache for the SWC at ``url``.
+
+    Skeletons are keyed by the body's mutation ID, so this is safe to use
+    with open nodes: once the body changes, the cached file is not used
+    anymore.
+    """
+    return os.path.join(_DISK_CACHE['path'], 'skeletons',
+                        '{}_{}.swc'.format(hashlib.sha1(url.encode()).hexdigest(),
+                                           mutation_id))
+
+
+# Globally defined default server, node and user
+_SETTINGS = {'server': None, 'node': None, 'user': None}
+
 
 def set_param(server=None, node=None, user=None):
     """ Set default server, node and/or user."""
     for p, n in zip([server, node, user], ['server', 'node', 'user']):
         if not isinstance(p, type(None)):
-            globals()[n] = p
+            _SETTINGS[n] = p
 
 
 def eval_param(server=None, node=None, user=None):
     """ Helper to read globally defined settings."""
-    parsed = {}
-    for p, n in zip([server, node, user], ['server', 'node', 'user']):
-        if isinstance(p, type(None)):
-            parsed[n] = globals().get(n, None)
-        else:
-            parsed[n] = p
-
-    return [parsed[n] for n in ['server', 'node', 'user']]
+    return (_SETTINGS['server'] if server is None else server,
+            _SETTINGS['node'] if node is None else node,
+            _SETTINGS['user'] if user is None else user)
 
 
 def get_skeleton(bodyid, save_to=None, xform=None, root=None, soma=None,
                  heal=False, check_mutation=True, server=None, node=None,
-                 verbose=True, **kwargs):
+                 verbose=True, use_cache=True, max_workers=16, **kwargs):
     """ Download skeleton as SWC file.
 
     Parameters
@@ -81,6 +314,15 @@ def get_skeleton(bodyid, save_to=None, xform=None, root=None, soma=None,
                     If not provided, will try reading from global.
     node :          str, optional
                     If not provided, will try reading from global.
+    use_cache :     bool, optional
+                    If False, will bypass the on-disk cache (see
+                    ``dvidtools.set_cache``). If ``check_mutation=True``,
+                    cached skeletons are keyed by the body's mutation ID
+                    and only up-to-date skeletons are cached. This makes the
+                    cache safe to use with open nodes.
+    max_workers :   int, optional
+                    Max number of parallel requests to the server if
+                    ``bodyid`` is a list.
 
     Returns
     -------
@@ -113,20 +355,27 @@ def get_skeleton(bodyid, save_to=None, xform=None, root=None, soma=None,
     """
 
     if isinstance(bodyid, (list, np.ndarray)):
+        # Resolve settings only once for all bodies
+        server, node, user = eval_param(server, node)
+
         if save_to and not os.path.isdir(save_to):
             raise ValueError('"save_to" must be path when loading multiple'
                              'multiple bodies')
-        resp = {x: get_skeleton(x,
-                                save_to=save_to,
-                                check_mutation=check_mutation,
-                                verbose=verbose,
-                                heal=heal,
-                                soma=soma,
-                                xform=xform,
-                                server=server,
-                                node=node,
-                                **kwargs) for x in tqdm(bodyid,
-                                                        desc='Loading')}
+        skeletons = utils.run_threaded(get_skeleton, bodyid,
+                                       max_workers=max_workers,
+                                       desc='Loading',
+                                       save_to=save_to,
+                                       check_mutation=check_mutation,
+                                       use_cache=use_cache,
+                                       verbose=verbose,
+                                       heal=heal,
+                                       soma=soma,
+                                       root=root,
+                                       xform=xform,
+                                       server=server,
+                                       node=node,
+                                       **kwargs)
+        resp = dict(zip(bodyid, skeletons))
         # Give summary
         missing = [str(k) for k, v in resp.items() if isinstance(v, type(None))]
         print('{}/{} skeletons successfully downloaded.'.format(len(resp) - len(missing),
@@ -143,16 +392,35 @@ def get_skeleton(bodyid, save_to=None, xform=None, root=None, soma=None,
 
     server, node, user = eval_param(server, node)
 
-    r = requests.get('{}/api/node/{}/{}_skeletons/key/{}_swc'.format(server,
-                                                                     node,
-                                                                     config.segmentation,
-                                                                     bodyid))
+    url = _make_url('{}_skeletons/key/{}_swc', config.segmentation, bodyid,
+                    server=server, node=node)
+
+    swc, body_mut, cache_file = None, None, None
+    if check_mutation and use_cache and _DISK_CACHE['enabled']:
+        # Look for a skeleton cached for the body's current mutation
+        try:
+            body_mut = get_last_mod(bodyid, server=server,
+                                    node=node).get('mutation id')
+        except requests.HTTPError:
+            body_mut = None
+
+        if not isinstance(body_mut, type(None)):
+            cache_file = _skeleton_cache_file(url, body_mut)
+            if os.path.isfile(cache_file):
+                with open(cache_file, 'rb') as f:
+                    swc = f.read()
+
+    if isinstance(swc, type(None)):
+        # If we check the mutation, we use the mutation-keyed cache instead.
+        # Note that we keep the raw bytes: decoding the entire SWC to str is
+        # costly and not necessary for parsing
+        swc = _cached_get(url, use_cache=use_cache and not check_mutation).content
 
     #r.raise_for_status()
 
-    if 'not found' in r.text:
+    if b'not found' in swc:
         if verbose:
-            print(r.text)
+            print(swc.decode())
         return None
 
     # Save raw SWC before making any changes
@@ -162,26 +430,38 @@ def get_skeleton(bodyid, save_to=None, xform=None, root=None, soma=None,
         if os.path.isdir(save_raw_to):
             save_raw_to = os.path.join(save_raw_to, '{}.swc'.format(bodyid))
 
-        with open(save_raw_to, 'w') as f:
-            f.write(r.text)
+        with open(save_raw_to, 'wb') as f:
+            f.write(swc)
 
     # Parse SWC string
-    df, header = utils.parse_swc_str(r.text)
+    df, header = utils.parse_swc_str(swc)
 
     if 'mutation id' in header:
-        df.mutation_id = int(re.search('"mutation id": (.*?)}', header).group(1))
+        df.mutation_id = int(_MUT_ID_RE.search(header).group(1))
 
     if check_mutation:
         if not getattr(df, 'mutation_id', None):
             print('{} - Unable to check mutation: mutation ID not in '
                   'SWC header'.format(bodyid))
         else:
-            body_mut = get_last_mod(bodyid,
-                                    server=server,
-                                    node=node).get('mutation id')
+            if isinstance(body_mut, type(None)):
+                body_mut = get_last_mod(bodyid,
+                                        server=server,
+                                        node=node).get('mutation id')
+
             if df.mutation_id != body_mut:
                 print("{}: mutation IDs of skeleton and mesh don't match. "
                       "The skeleton might not be up-to-date.".format(bodyid))
+            elif cache_file and not os.path.isfile(cache_file):
+                # Skeleton is up-to-date -> cache it and drop any outdated
+                # versions of it
+                cache_dir = os.path.dirname(cache_file)
+                prefix = os.path.basename(cache_file).split('_')[0] + '_'
+                if os.path.isdir(cache_dir):
+                    for f in os.listdir(cache_dir):
+                        if f.startswith(prefix):
+                            os.remove(os.path.join(cache_dir, f))
+                _write_cache_file(cache_file, swc)
 
     # Heal first as this might change node IDs
     if heal:
@@ -195,23 +475,25 @@ def get_skeleton(bodyid, save_to=None, xform=None, root=None, soma=None,
     if callable(root):
         root = root(bodyid)
 
-    # If we have a soma
-    if isinstance(soma, (list, tuple, np.ndarray)):
-        # Get soma node
-        soma_node = utils._snap_to_skeleton(df, soma)
-
-        # Set label
-        df.loc[df.node_id == soma_node, 'label'] = 1
+    has_soma = isinstance(soma, (list, tuple, np.ndarray))
+    has_root = isinstance(root, (list, tuple, np.ndarray))
 
+    # Snap soma and root to the skeleton in a single query
+    if has_soma and has_root:
+        soma_node, root_node = utils._snap_to_skeleton(df, [soma, root])
+    elif has_soma:
         # If root is not explicitly provided, reroot to soma
-        if not isinstance(root, (list, tuple, np.ndarray)):
-            root = soma
-
-    # If we have a root
-    if isinstance(root, (list, tuple, np.ndarray)):
-        # Get soma node
+        soma_node = root_node = utils._snap_to_skeleton(df, soma)
+    elif has_root:
         root_node = utils._snap_to_skeleton(df, root)
 
+    # If we have a soma
+    if has_soma:
+        # Set label
+        df.loc[df.node_id == soma_node, 'label'] = 1
+
+    # If we have a root (or soma)
+    if has_soma or has_root:
         # Reroot
         utils.reroot_skeleton(df, root_node, inplace=True)
 
@@ -221,20 +503,22 @@ def get_skeleton(bodyid, save_to=None, xform=None, root=None, soma=None,
         header += '\n'.join(['#' + l for l in inspect.getsource(xform).split('\n') if l])
 
         # Transform coordinates
-        df.iloc[:, 2:5] = xform(df.iloc[:, 2:5].values)
+        coords = np.asarray(xform(df.iloc[:, 2:5].values), dtype=float)
+        df.iloc[:, 2:5] = coords
 
         # Check if any coordinates got messed up
-        nans = df[np.any(df.iloc[:, 2:5].isnull(), axis=1)]
-        if not nans.empty:
+        is_nan = np.isnan(coords).any(axis=1)
+        if np.any(is_nan):
             if verbose:
-                print('{} nodes did not xform - removing & stitching...'.format(nans.shape[0]))
+                print('{} nodes did not xform - removing & stitching...'.format(is_nan.sum()))
             # Drop nans
-            df.drop(nans.index, inplace=True)
+            df.drop(index=df.index[is_nan], inplace=True)
+            node_ids, parent_ids = df.node_id.values, df.parent_id.values
             # Keep track of existing root (if any left)
-            root = df.loc[df.parent_id < 0, 'node_id']
-            root = root.values[0] if not root.empty else None
+            root = node_ids[parent_ids < 0]
+            root = root[0] if root.size else None
             # Set orphan nodes to roots
-            df.loc[~df.parent_id.isin(df.node_id), 'parent_id'] = -1
+            df.loc[~np.isin(parent_ids, node_ids), 'parent_id'] = -1
             # Heal fragments
             utils.heal_skeleton(df, root=root, inplace=True)
     elif not isinstance(xform, type(None)):
@@ -242,7 +526,7 @@ def get_skeleton(bodyid, save_to=None, xform=None, root=None, soma=None,
 
     if save_to:
         # Make sure table is still conform with SWC format
-        if heal or not isinstance(root, type(None)):
+        if heal or has_soma or has_root:
             df = utils.refurbish_table(df)
 
         # Generate proper filename if necessary
@@ -257,7 +541,7 @@ def get_skeleton(bodyid, save_to=None, xform=None, root=None, soma=None,
 
 
 def get_user_bookmarks(server=None, node=None, user=None,
-                       return_dataframe=True):
+                       return_dataframe=True, return_type=None):
     """ Get user bookmarks.
 
     Parameters
@@ -270,24 +554,40 @@ def get_user_bookmarks(server=None, node=None, user=None,
                         If not provided, will try reading from global.
     return_dataframe :  bool, optional
                         If True, will return pandas.DataFrame. If False,
-                        returns original json.
+                        returns original json. Ignored if ``return_type``
+                        is given.
+    return_type :       "dataframe" | "records" | "arrays", optional
+                        "records" returns the original json, "arrays" a
+                        dict of numpy arrays (one per column).
 
     Returns
     -------
-    bookmarks : pandas.DataFrame or json
+    bookmarks : pandas.DataFrame, json or dict of arrays
 
     """
+    if isinstance(return_type, type(None)):
+        return_type = 'dataframe' if return_dataframe else 'records'
+    _check_return_type(return_type)
+
     server, node, user = eval_param(server, node, user)
 
-    r = requests.get('{}/api/node/{}/bookmark_annotations/tag/user:{}'.format(server, node, user))
+    r = _SESSION.get(_make_url('bookmark_annotations/tag/user:{}', user,
+                               server=server, node=node))
+
+    data = _parse_json(r)
 
-    if return_dataframe:
-        data = r.json()
+    if return_type == 'dataframe':
+        # Unpack properties into columns in one go
+        df = pd.DataFrame.from_records(data)
+        if 'Prop' in df.columns:
+            props = pd.DataFrame(df.pop('Prop').tolist(), index=df.index)
+            df = pd.concat([df, props], axis=1)
+        return df
+    elif return_type == 'arrays':
         for d in data:
             d.update(d.pop('Prop'))
-        return pd.DataFrame.from_records(data)
-    else:
-        return r.json()
+
+    return _format_records(data, return_type)
 
 
 def add_bookmarks(data, verify=True, server=None, node=None):
@@ -341,7 +641,8 @@ def add_bookmarks(data, verify=True, server=None, node=None):
 
         utils.verify_payload(data, required=required, required_only=True)
 
-    r = requests.post('{}/api/node/{}/bookmark_annotations/elements'.format(server, node),
+    r = _SESSION.post(_make_url('bookmark_annotations/elements',
+                                server=server, node=node),
                       json=data)
 
     r.raise_for_status()
@@ -369,13 +670,11 @@ def get_annotation(bodyid, server=None, node=None, verbose=True):
     """
     server, node, user = eval_param(server, node)
 
-    r = requests.get('{}/api/node/{}/{}_annotations/key/{}'.format(server,
-                                                                   node,
-                                                                   config.body_labels,
-                                                                   bodyid))
+    r = _SESSION.get(_make_url('{}_annotations/key/{}', config.body_labels,
+                               bodyid, server=server, node=node))
 
     try:
-        return r.json()
+        return _parse_json(r)
     except:
         if verbose:
             print(r.text)
@@ -445,10 +744,8 @@ def edit_annotation(bodyid, annotation, server=None, node=None, verbose=True):
     # Update annotations
     old_an.update(annotation)
 
-    r = requests.post('{}/api/node/{}/{}_annotations/key/{}'.format(server,
-                                                                    node,
-                                                                    config.body_labels,
-                                                                    bodyid),
+    r = _SESSION.post(_make_url('{}_annotations/key/{}', config.body_labels,
+                                bodyid, server=server, node=node),
                       json=old_an)
 
     # Check if it worked
@@ -460,10 +757,15 @@ def edit_annotation(bodyid, annotation, server=None, node=None, verbose=True):
 def get_body_id(pos, server=None, node=None):
     """ Get body ID at given position.
 
+    Multiple positions are queried in a single request (see
+    ``dvidtools.get_multiple_bodyids``) - pass them all at once instead of
+    calling this function in a loop.
+
     Parameters
     ----------
     pos :       iterable
-                [x, y, z] position to query.
+                [x, y, z] position to query. Can also be
+                [[x1, y1, z1], [x2, y2, z2], ..] for multiple positions.
     server :    str, optional
                 If not provided, will try reading from global.
     node :      str, optional
@@ -472,18 +774,23 @@ def get_body_id(pos, server=None, node=None):
     Returns
     -------
     body_id :   str
+    numpy.ndarray
+                If multiple positions were queried.
     """
+    if np.ndim(pos) == 2:
+        return get_multiple_bodyids(pos, server=server, node=node)
+
     server, node, user = eval_param(server, node)
 
-    r = requests.get('{}/api/node/{}/{}/label/{}_{}_{}'.format(server, node,
-                                                               config.segmentation,
-                                                               pos[0], pos[1],
-                                                               pos[2]))
+    r = _SESSION.get(_make_url('{}/label/{}_{}_{}', config.segmentation,
+                               pos[0], pos[1], pos[2],
+                               server=server, node=node))
 
-    return r.json()['Label']
+    return _parse_json(r)['Label']
 
 
-def get_multiple_bodyids(pos, server=None, node=None):
+def get_multiple_bodyids(pos, server=None, node=None, chunk_size=10000,
+                         max_workers=8):
     """ Get body IDs at given positions.
 
     Parameters
@@ -495,25 +802,44 @@ def get_multiple_bodyids(pos, server=None, node=None):
                 If not provided, will try reading from global.
     node :      str, optional
                 If not provided, will try reading from global.
+    chunk_size : int, optional
+                Max number of positions to query per request.
+    max_workers : int, optional
+                Max number of chunks to query in parallel.
 
     Returns
     -------
-    body_ids :  list
+    body_ids :  numpy.ndarray
+                Array of int64 body IDs.
     """
     server, node, user = eval_param(server, node)
 
-    if isinstance(pos, np.ndarray):
-        pos = pos.tolist()
+    # orjson can only serialize C-contiguous arrays (e.g. ``df.values`` of
+    # a DataFrame is typically Fortran-ordered)
+    pos = np.ascontiguousarray(np.reshape(pos, (-1, 3)), dtype=np.int64)
 
-    r = requests.request('GET',
-                         url="{}/api/node/{}/{}/labels".format(server,
-                                                               node,
-                                                               config.segmentation),
-                         json=pos)
+    url = _make_url('{}/labels', config.segmentation, server=server, node=node)
 
-    r.raise_for_status()
+    def fetch_chunk(chunk):
+        # orjson serializes numpy arrays directly - no need for lists
+        if orjson:
+            data = orjson.dumps(chunk, option=orjson.OPT_SERIALIZE_NUMPY)
+        else:
+            data = json.dumps(chunk.tolist())
 
-    return r.json()
+        r = _SESSION.request('GET', url=url, data=data,
+                             headers={'Content-Type': 'application/json'})
+
+        r.raise_for_status()
+
+        return _parse_json(r)
+
+    # Query chunks in parallel
+    chunks = [pos[i: i + chunk_size] for i in range(0, pos.shape[0], chunk_size)]
+    bodies = utils.run_threaded(fetch_chunk, chunks, max_workers=max_workers,
+                                progress=False)
+
+    return np.fromiter(itertools.chain.from_iterable(bodies), dtype=np.int64)
 
 
 def get_body_position(bodyid, server=None, node=None):
@@ -542,44 +868,24 @@ def get_body_position(bodyid, server=None, node=None):
 
     if isinstance(s, pd.DataFrame) and not s.empty:
         # Return the root (more likely to be actually within the mesh?)
-        return s.loc[0, ['x', 'y', 'z']].values
+        # Note: reading the first row from the column arrays avoids the
+        # label-based indexer and a copy of the entire table
+        return np.array([s[c].values[0] for c in ('x', 'y', 'z')])
     else:
-        # First get voxels of the coarse neuron
-        voxels = get_neuron(bodyid, scale='coarse', ret_type='INDEX',
-                            server=server, node=node)
-
-        # Erode surface voxels to make sure we get a central position
-        while True:
-            eroded = mesh.remove_surface_voxels(voxels)
-
-            # Stop before no more voxels left
-            if eroded.size == 0:
-                break
-
-            voxels = eroded
-
-        # Now query the more precise mesh for this coarse voxel
-        # Pick a random voxel
-        v = voxels[0] * 64
-        # Generate a bounding bbox
-        bbox = np.vstack([v,v]).T
-        bbox[:, 1] += 63
-
-        voxels = get_neuron(bodyid, scale=0, ret_type='INDEX',
-                            bbox=bbox.ravel(),
-                            server=server, node=node)
-
-        # Erode surface voxels again to make sure we get a central position
-        while True:
-            eroded = mesh.remove_surface_voxels(voxels)
-
-            # Stop before no more voxels left
-            if eroded.size == 0:
-                break
+        # Get the coarse voxel furthest from the surface -> central position
+        v = mesh.get_deepest_voxel(get_neuron(bodyid, scale='coarse',
+                                              ret_type='INDEX',
+                                              server=server, node=node))
 
-            voxels = eroded
+        # Bounding box of that coarse voxel at scale 0:
+        # [x_min, x_max, y_min, y_max, z_min, z_max]
+        bbox = np.stack([v * 64, v * 64 + 63], axis=1).ravel()
 
-        return voxels[0]
+        # Now query the more precise mesh for this coarse voxel and again get
+        # the voxel furthest from the surface
+        return mesh.get_deepest_voxel(get_neuron(bodyid, scale=0,
+                                                 ret_type='INDEX', bbox=bbox,
+                                                 server=server, node=node))
 
 
 def get_body_profile(bodyid, server=None, node=None):
@@ -602,12 +908,12 @@ def get_body_profile(bodyid, server=None, node=None):
 
     bodyid = utils.parse_bid(bodyid)
 
-    r = requests.request('GET',
-                              url="{}/api/node/{}/{}/sparsevol-size/{}".format(server, node, config.segmentation, bodyid))
+    r = _SESSION.get(_make_url('{}/sparsevol-size/{}', config.segmentation,
+                               bodyid, server=server, node=node))
 
     r.raise_for_status()
 
-    return r.json()
+    return _parse_json(r)
 
 
 def get_assignment_status(pos, window=None, bodyid=None, server=None, node=None):
@@ -650,60 +956,59 @@ def get_assignment_status(pos, window=None, bodyid=None, server=None, node=None)
         pos = pos.astype(int)
         window = window if isinstance(window, np.ndarray) else np.array(window)
 
-        r = requests.get('{}/api/node/{}/bookmarks/keyrange/'
-                         '{}_{}_{}/{}_{}_{}'.format(server,
-                                                    node,
-                                                    int(pos[0]-window[0]/2),
-                                                    int(pos[1]-window[1]/2),
-                                                    int(pos[2]-window[2]/2),
-                                                    int(pos[0]+window[0]/2),
-                                                    int(pos[1]+window[1]/2),
-                                                    int(pos[2]+window[2]/2),))
+        r = _SESSION.get(_make_url('bookmarks/keyrange/{}_{}_{}/{}_{}_{}',
+                                   int(pos[0]-window[0]/2),
+                                   int(pos[1]-window[1]/2),
+                                   int(pos[2]-window[2]/2),
+                                   int(pos[0]+window[0]/2),
+                                   int(pos[1]+window[1]/2),
+                                   int(pos[2]+window[2]/2),
+                                   server=server, node=node))
         r.raise_for_status()
 
         # Above query returns coordinates that are in lexicographically
         # between key1 and key2 -> we have to filter for those inside the
         # bounding box ourselves
-        coords = np.array([c.split('_') for c in r.json()]).astype(int)
+        coords = np.fromiter((int(x) for c in _parse_json(r) for x in c.split('_')),
+                             dtype=np.int64).reshape(-1, 3)
+        lo, hi = pos - window / 2, pos + window / 2
+        coords = coords[((coords > lo) & (coords < hi)).all(axis=1)]
 
         # If provided, make sure all coordinates in window are from given
         # body ID(s)
-        if not isinstance(bodyid, type(None)):
+        if not isinstance(bodyid, type(None)) and coords.size:
             if not isinstance(bodyid, (list, np.ndarray)):
                 bodyid = [bodyid]
 
-            bids = np.array(get_multiple_bodyids(coords,
-                                                 server=server,
-                                                 node=node
-                                                 ))
+            bids = get_multiple_bodyids(coords, server=server, node=node)
 
-            coords = coords[np.in1d(bids, bodyid)]
+            # Single body ID is the common case -> simple comparison
+            if len(bodyid) == 1:
+                coords = coords[bids == int(bodyid[0])]
+            else:
+                coords = coords[np.isin(bids, np.asarray(bodyid, dtype=np.int64))]
 
         if coords.size == 0:
             return []
 
-        coords = coords[(coords > (pos - window / 2)).all(axis=1)]
-        coords = coords[(coords < (pos + window / 2)).all(axis=1)]
-
-        return [get_assignment_status(c,
-                                      window=None,
-                                      bodyid=bodyid,
-                                      server=server,
-                                      node=node) for c in coords]
+        # Fetch status for each remaining coordinate in parallel
+        return utils.run_threaded(get_assignment_status, coords,
+                                  progress=False,
+                                  window=None, bodyid=bodyid,
+                                  server=server, node=node)
 
-    r = requests.get('{}/api/node/{}/bookmarks/key/{}_{}_{}'.format(server,
-                                                                    node,
-                                                                    int(pos[0]),
-                                                                    int(pos[1]),
-                                                                    int(pos[2])))
+    r = _SESSION.get(_make_url('bookmarks/key/{}_{}_{}',
+                               int(pos[0]), int(pos[1]), int(pos[2]),
+                               server=server, node=node))
 
     # Will raise if key not found -> so just don't
     # r.raise_for_status()
 
-    return r.json() if r.text and 'not found' not in r.text else None
+    return _parse_json(r) if r.text and 'not found' not in r.text else None
 
 
-def get_labels_in_area(offset, size, server=None, node=None):
+def get_labels_in_area(offset, size, server=None, node=None,
+                       return_type='dataframe'):
     """ Get labels (todo, to split, etc.) in given bounding box.
 
     Parameters
@@ -716,30 +1021,30 @@ def get_labels_in_area(offset, size, server=None, node=None):
                 If not provided, will try reading from global.
     node :      str, optional
                 If not provided, will try reading from global.
+    return_type : "dataframe" | "records" | "arrays", optional
+                "records" returns the original json, "arrays" a dict of
+                numpy arrays (one per column).
 
     Returns
     -------
-    todo tags : pandas.DataFrame
+    todo tags : pandas.DataFrame, json or dict of arrays
+                None if no labels in area.
     """
+    _check_return_type(return_type)
+
     server, node, user = eval_param(server, node)
 
-    r = requests.get('{}/api/node/{}/{}_todo/elements/'
-                     '{}_{}_{}/{}_{}_{}'.format(server,
-                                                node,
-                                                config.segmentation,
-                                                int(size[0]),
-                                                int(size[1]),
-                                                int(size[2]),
-                                                int(offset[0]),
-                                                int(offset[1]),
-                                                int(offset[2])))
+    r = _SESSION.get(_make_url('{}_todo/elements/{}_{}_{}/{}_{}_{}',
+                               config.segmentation, int(size[0]), int(size[1]),
+                               int(size[2]), int(offset[0]), int(offset[1]),
+                               int(offset[2]), server=server, node=node))
 
     r.raise_for_status()
 
-    j = r.json()
+    j = _parse_json(r)
 
     if j:
-        return pd.DataFrame.from_records(r.json())
+        return _format_records(j, return_type)
     else:
         return None
 
@@ -761,15 +1066,22 @@ def get_available_rois(server=None, node=None, step_size=2):
 
     server, node, user = eval_param(server, node)
 
-    r = requests.get('{}/api/node/{}/rois/keys'.format(server, node))
+    # Return a copy so that the cached list can't be modified
+    return list(_get_available_rois(server, node))
+
+
+@functools.lru_cache(maxsize=32)
+def _get_available_rois(server, node):
+    """ Cached fetch of available ROIs."""
+    r = _cached_get(_make_url('rois/keys', server=server, node=node))
 
     r.raise_for_status()
 
-    return r.json()
+    return tuple(_parse_json(r))
 
 
 def get_roi(roi, step_size=2, form='MESH', voxel_size=(32, 32, 32),
-            save_to=None, server=None, node=None):
+            save_to=None, server=None, node=None, use_cache=True):
     """ Get ROI as either mesh, voxels or ``.obj`` file.
 
     Uses marching cube algorithm to extract surface model of ROI voxels. The
@@ -798,6 +1110,9 @@ def get_roi(roi, step_size=2, form='MESH', voxel_size=(32, 32, 32),
                     If not provided, will try reading from global.
     node :          str, optional
                     If not provided, will try reading from global.
+    use_cache :     bool, optional
+                    If False, will bypass the on-disk cache (see
+                    ``dvidtools.set_cache``).
 
     Returns
     -------
@@ -815,12 +1130,13 @@ def get_roi(roi, step_size=2, form='MESH', voxel_size=(32, 32, 32),
     server, node, user = eval_param(server, node)
 
     if form.upper() in ['MESH', 'VOXELS', 'BLOCKS']:
-        r = requests.get('{}/api/node/{}/{}/roi'.format(server, node, roi))
+        r = _cached_get(_make_url('{}/roi', roi, server=server, node=node),
+                        use_cache=use_cache)
 
         r.raise_for_status()
 
         # The data returned are block coordinates: [z, y, x_start, x_end]
-        blocks = np.array(r.json())
+        blocks = np.array(_parse_json(r))
 
         if form.upper() == 'BLOCKS':
             return blocks
@@ -833,12 +1149,12 @@ def get_roi(roi, step_size=2, form='MESH', voxel_size=(32, 32, 32),
         return verts, faces
     elif form.upper() == 'OBJ':
         # Get the key for this roi
-        r = requests.get('{}/api/node/{}/rois/key/{}'.format(server, node, roi))
-        r.raise_for_status()
-        key = r.json()['->']['key']
+        key = _get_roi_key(server, node, roi)
 
         # Get the obj string
-        r = requests.get('{}/api/node/{}/roi_data/key/{}'.format(server, node, key))
+        r = _cached_get(_make_url('roi_data/key/{}', key,
+                                  server=server, node=node),
+                        use_cache=use_cache)
         r.raise_for_status()
 
         if save_to:
@@ -853,7 +1169,8 @@ def get_roi(roi, step_size=2, form='MESH', voxel_size=(32, 32, 32),
 
 
 def get_neuron(bodyid, scale='COARSE', step_size=2, save_to=None,
-               ret_type='MESH', bbox=None, server=None, node=None):
+               ret_type='MESH', bbox=None, server=None, node=None,
+               use_cache=True):
     """ Get neuron as mesh.
 
     Parameters
@@ -880,6 +1197,9 @@ def get_neuron(bodyid, scale='COARSE', step_size=2, save_to=None,
                 If not provided, will try reading from global.
     node :      str, optional
                 If not provided, will try reading from global.
+    use_cache : bool, optional
+                If False, will bypass the on-disk cache (see
+                ``dvidtools.set_cache``).
 
     Returns
     -------
@@ -895,20 +1215,16 @@ def get_neuron(bodyid, scale='COARSE', step_size=2, save_to=None,
 
     bodyid = utils.parse_bid(bodyid)
 
-    # Get voxel sizes based on scale
-    info = get_segmentation_info(server, node)['Extended']
-
-    vsize = {'COARSE' : info['BlockSize']}
-    vsize.update({i: np.array(info['VoxelSize']) * 2**i for i in range(info['MaxDownresLevel'])})
-
-    if isinstance(scale, int) and scale > info['MaxDownresLevel']:
-        raise ValueError('Scale greater than MaxDownresLevel')
-    elif isinstance(scale, str):
+    if isinstance(scale, str):
         scale = scale.upper()
+    elif isinstance(scale, (int, np.number)):
+        info = _get_segmentation_info(server, node, config.segmentation)
+        if scale > info['Extended']['MaxDownresLevel']:
+            raise ValueError('Scale greater than MaxDownresLevel')
 
     if not isinstance(bbox, type(None)):
-        url = '{}/api/node/{}/{}/sparsevol/{}'.format(server, node,
-                                                      config.segmentation, bodyid)
+        url = _make_url('{}/sparsevol/{}', config.segmentation, bodyid,
+                        server=server, node=node)
         url += '?minx={}&maxx={}&miny={}&maxy={}&minz={}&maxz={}'.format(int(bbox[0]),
                                                                          int(bbox[1]),
                                                                          int(bbox[2]),
@@ -916,36 +1232,37 @@ def get_neuron(bodyid, scale='COARSE', step_size=2, save_to=None,
                                                                          int(bbox[4]),
                                                                          int(bbox[5]))
     elif scale == 'COARSE':
-        url = '{}/api/node/{}/{}/sparsevol-coarse/{}'.format(server, node,
-                                                             config.segmentation,
-                                                             bodyid)
+        url = _make_url('{}/sparsevol-coarse/{}', config.segmentation, bodyid,
+                        server=server, node=node)
     elif isinstance(scale, (int, np.number)):
-        url = '{}/api/node/{}/{}/sparsevol/{}?scale={}'.format(server, node,
-                                                               config.segmentation,
-                                                               bodyid, scale)
+        url = _make_url('{}/sparsevol/{}?scale={}', config.segmentation,
+                        bodyid, scale, server=server, node=node)
     else:
         raise TypeError('scale must be "COARSE" or integer, not "{}"'.format(scale))
 
-    r = requests.get(url)
-    r.raise_for_status()
-
-    b = r.content
+    # Stream the response to avoid holding the full binary in memory
+    with _cached_get(url, use_cache=use_cache, stream=True) as r:
+        r.raise_for_status()
 
-    if save_to:
-        with open(save_to, 'wb') as f:
-            f.write(b)
-        return
+        if save_to:
+            with open(save_to, 'wb') as f:
+                shutil.copyfileobj(r.raw, f, length=1 << 20)
+            return
 
-    # Decode binary format
-    header, voxels = decode.decode_sparsevol(b, format='rles')
+        # Decode binary format
+        header, voxels = decode.decode_sparsevol(r.raw, format='rles')
 
     if ret_type.upper() == 'INDEX':
         return voxels
-    elif ret_type.upper() == 'COORDS':
-        return voxels * vsize[scale]
+
+    # Get voxel size based on scale
+    vsize = _get_voxel_size(server, node, config.segmentation, scale)
+
+    if ret_type.upper() == 'COORDS':
+        return voxels * vsize
 
     verts, faces = mesh.mesh_from_voxels(voxels,
-                                         v_size=vsize[scale],
+                                         v_size=vsize,
                                          step_size=step_size)
 
     return verts, faces
@@ -954,6 +1271,9 @@ def get_neuron(bodyid, scale='COARSE', step_size=2, save_to=None,
 def get_segmentation_info(server=None, node=None):
     """ Returns segmentation info as dictionary.
 
+    Results are cached per server, node and segmentation. Use
+    ``dvidtools.clear_cache`` to force a refresh.
+
     Parameters
     ----------
     server :    str, optional
@@ -964,9 +1284,81 @@ def get_segmentation_info(server=None, node=None):
 
     server, node, user = eval_param(server, node)
 
-    r = requests.get('{}/api/node/{}/{}/info'.format(server, node, config.segmentation))
+    info = _get_segmentation_info(server, node, config.segmentation)
 
-    return r.json()
+    # Return a copy so that changes don't propagate into the cache
+    return copy.deepcopy(info)
+
+
+@functools.lru_cache(maxsize=32)
+def _get_segmentation_info(server, node, segmentation):
+    """ Cached fetch of segmentation info."""
+    r = _cached_get(_make_url('{}/info', segmentation,
+                              server=server, node=node))
+    r.raise_for_status()
+
+    return _parse_json(r)
+
+
+@functools.lru_cache(maxsize=128)
+def _get_voxel_size(server, node, segmentation, scale):
+    """ Cached voxel size (x, y, z) for given scale ("COARSE" or int)."""
+    info = _get_segmentation_info(server, node, segmentation)['Extended']
+
+    if scale == 'COARSE':
+        vsize = np.array(info['BlockSize'])
+    else:
+        vsize = np.array(info['VoxelSize']) * 2**int(scale)
+
+    # Make sure the cached array can't be changed in-place
+    vsize.setflags(write=False)
+
+    return vsize
+
+
+@functools.lru_cache(maxsize=256)
+def _get_roi_key(server, node, roi):
+    """ Cached fetch of the key under which a ROI's ``.obj`` is stored."""
+    r = _cached_get(_make_url('rois/key/{}', roi, server=server, node=node))
+    r.raise_for_status()
+
+    return _parse_json(r)['->']['key']
+
+
+def clear_cache(disk=True):
+    """ Clear cached server responses.
+
+    Segmentation info, available ROIs and ROI keys are cached per server and
+    node because they don't change for a given node. Use this function if
+    the data on the server has changed nonetheless (e.g. because you are
+    working on an uncommitted node). This also clears connectivity cached
+    via ``use_cache=True`` in ``get_connectivity`` and ``get_adjacency``.
+
+    Parameters
+    ----------
+    disk :      bool, optional
+                If True, will also clear the on-disk cache (see
+                ``dvidtools.set_cache``).
+    """
+    _get_segmentation_info.cache_clear()
+    _get_voxel_size.cache_clear()
+    _get_roi_key.cache_clear()
+    _get_available_rois.cache_clear()
+    with _LAST_MOD_LOCK:
+        _LAST_MOD_CACHE.clear()
+    _get_connectivity_coo_cached.cache_clear()
+
+    if disk and os.path.isdir(_DISK_CACHE['path']):
+        for f in os.listdir(_DISK_CACHE['path']):
+            # Only remove files that look like they were generated by us
+            if re.fullmatch('[0-9a-f]{40}', f):
+                os.remove(os.path.join(_DISK_CACHE['path'], f))
+
+        skeleton_dir = os.path.join(_DISK_CACHE['path'], 'skeletons')
+        if os.path.isdir(skeleton_dir):
+            for f in os.listdir(skeleton_dir):
+                if re.fullmatch(r'[0-9a-f]{40}_.*\.swc', f):
+                    os.remove(os.path.join(skeleton_dir, f))
 
 
 def get_n_synapses(bodyid, server=None, node=None):
@@ -985,35 +1377,41 @@ def get_n_synapses(bodyid, server=None, node=None):
     Returns
     -------
     dict
-                ``{'PreSyn': int, 'PostSyn': int}``
+                ``{'pre': int, 'post': int}``
+    pandas.DataFrame
+                If multiple body IDs are queried.
     """
 
     server, node, user = eval_param(server, node)
 
-    bodyid = utils.parse_bid(bodyid)
+    is_list = isinstance(bodyid, (list, np.ndarray))
+    bodies = bodyid if is_list else [bodyid]
 
-    if isinstance(bodyid, (list, np.ndarray)):
-        syn = {b: get_n_synapses(b, server, node) for b in bodyid}
-        return pd.DataFrame.from_records(syn).T
+    def fetch_count(query):
+        b, kind = query
+        r = _SESSION.get(_make_url('{}_labelsz/count/{}/{}', config.synapses,
+                                   b, kind, server=server, node=node))
+        r.raise_for_status()
+        return _parse_json(r).get(kind, None)
 
-    r = requests.get('{}/api/node/{}/{}_labelsz/count/{}/PreSyn'.format(server,
-                                                                        node,
-                                                                        config.synapses,
-                                                                        bodyid))
-    r.raise_for_status()
-    pre = r.json()
+    # Fetch pre- and postsynapse counts for all bodies in parallel
+    queries = [(utils.parse_bid(b), kind)
+               for b in bodies for kind in ['PreSyn', 'PostSyn']]
+    counts = utils.run_threaded(fetch_count, queries,
+                                desc='Fetching',
+                                progress=is_list)
 
-    r = requests.get('{}/api/node/{}/{}_labelsz/count/{}/PostSyn'.format(server,
-                                                                         node,
-                                                                         config.synapses,
-                                                                         bodyid))
-    r.raise_for_status()
-    post = r.json()
+    syn = {b: {'pre': counts[i * 2], 'post': counts[i * 2 + 1]}
+           for i, b in enumerate(bodies)}
+
+    if not is_list:
+        return syn[bodyid]
 
-    return {'pre': pre.get('PreSyn', None), 'post': post.get('PostSyn', None)}
+    return pd.DataFrame.from_records(syn).T
 
 
-def get_synapses(bodyid, pos_filter=None, with_details=False, server=None, node=None):
+def get_synapses(bodyid, pos_filter=None, with_details=False, server=None,
+                 node=None, bbox=None, return_type='dataframe'):
     """ Returns table of pre- and postsynapses associated with given body.
 
     Parameters
@@ -1030,10 +1428,21 @@ def get_synapses(bodyid, pos_filter=None, with_details=False, server=None, node=
                     If not provided, will try reading from global.
     node :          str, optional
                     If not provided, will try reading from global.
+    bbox :          list | None, optional
+                    Bounding box to which to restrict the query to. Much
+                    faster than ``pos_filter`` if you are only interested in
+                    synapses in a small part of a large body as only synapses
+                    within the bounding box are fetched from the server.
+                    Format: ``[x_min, x_max, y_min, y_max, z_min, z_max]``.
+    return_type :   "dataframe" | "records" | "arrays", optional
+                    "records" returns the original json, "arrays" a dict of
+                    numpy arrays (one per column) - e.g. ``Pos`` as (N, 3)
+                    array. Both skip the (comparatively) costly construction
+                    of a DataFrame.
 
     Returns
     -------
-    pandas.DataFrame
+    pandas.DataFrame, json or dict of arrays
 
     Examples
     --------
@@ -1044,31 +1453,105 @@ def get_synapses(bodyid, pos_filter=None, with_details=False, server=None, node=
     ...                                 pos_filter=lambda x: navis.in_volume(x, lh))
     """
 
+    _check_return_type(return_type)
+
     if isinstance(bodyid, (list, np.ndarray)):
-        tables = [get_synapses(b, pos_filter, server, node) for b in tqdm(bodyid,
-                                                              desc='Fetching')]
-        for b, tbl in zip(bodyid, tables):
-            tbl['bodyid'] = b
-        return pd.concat(tables, axis=0)
+        # Resolve settings only once for all bodies
+        server, node, user = eval_param(server, node)
+
+        tables = utils.run_threaded(get_synapses, bodyid, desc='Fetching',
+                                    pos_filter=pos_filter,
+                                    with_details=with_details,
+                                    bbox=bbox,
+                                    return_type=(return_type
+                                                 if return_type == 'dataframe'
+                                                 else 'records'),
+                                    server=server, node=node)
+
+        if return_type == 'dataframe':
+            for b, tbl in zip(bodyid, tables):
+                tbl['bodyid'] = b
+            syn = pd.concat(tables, axis=0)
+            # Categoricals with differing categories are concatenated as
+            # objects -> convert back
+            if 'Kind' in syn.columns:
+                syn['Kind'] = syn['Kind'].astype('category')
+            return syn
+
+        syn = [dict(s, bodyid=b) for b, tbl in zip(bodyid, tables) for s in tbl]
+        return _format_records(syn, return_type)
 
     server, node, user = eval_param(server, node)
 
     bodyid = utils.parse_bid(bodyid)
 
-    r = requests.get('{}/api/node/{}/{}/label/{}?relationships={}'.format(server, node, config.synapses, bodyid, str(with_details).lower()))
-
-    syn = r.json()
+    syn = _fetch_synapses(bodyid, with_details=with_details, bbox=bbox,
+                          server=server, node=node)
 
     if pos_filter:
         # Get filter
-        filtered = pos_filter(np.array([s['Pos'] for s in syn]))
+        filtered = pos_filter(_get_positions(syn))
 
-        if not any(filtered):
+        if not np.any(filtered):
             raise ValueError('No synapses left after filtering.')
 
-        syn = np.array(syn)[filtered]
+        syn = [s for s, keep in zip(syn, filtered) if keep]
+
+    syn = _format_records(syn, return_type)
+
+    if return_type == 'dataframe' and 'Kind' in syn.columns:
+        # Only a handful of distinct values -> store as categorical
+        syn['Kind'] = syn['Kind'].astype('category')
+
+    return syn
+
+
+def _fetch_synapses(bodyid, with_details=True, bbox=None, server=None,
+                    node=None):
+    """ Fetch list of synapses for a single body.
+
+    If ``bbox`` is provided, will fetch only synapses within the bounding box
+    and then use the segmentation to find those belonging to ``bodyid``.
+    Expects ``server`` and ``node`` to be already resolved.
+    """
+    if isinstance(bbox, type(None)):
+        r = _SESSION.get(_make_url('{}/label/{}?relationships={}',
+                                   config.synapses, bodyid,
+                                   str(with_details).lower(),
+                                   server=server, node=node))
+        r.raise_for_status()
+
+        return _parse_json(r)
+
+    # Bounding box is [x_min, x_max, y_min, y_max, z_min, z_max] with
+    # inclusive max -> +1 to get the size
+    bbox = np.asarray(bbox, dtype=np.int64).reshape(3, 2)
+    offset = bbox[:, 0]
+    size = bbox[:, 1] - bbox[:, 0] + 1
+
+    r = _SESSION.get(_make_url('{}/elements/{}_{}_{}/{}_{}_{}',
+                               config.synapses,
+                               size[0], size[1], size[2],
+                               offset[0], offset[1], offset[2],
+                               server=server, node=node))
+    r.raise_for_status()
+
+    syn = _parse_json(r)
+
+    if not syn:
+        return []
+
+    # Keep only synapses that are within our body
+    bids = get_multiple_bodyids(_get_positions(syn), server=server, node=node)
+    syn = [s for s, keep in zip(syn, bids == int(bodyid)) if keep]
+
+    # The elements endpoint always returns relationships -> drop them to
+    # match the label endpoint
+    if not with_details:
+        for s in syn:
+            s.pop('Rels', None)
 
-    return pd.DataFrame.from_records(syn)
+    return syn
 
 
 def get_connections(source, target, pos_filter=None, server=None, node=None):
@@ -1110,16 +1593,12 @@ def get_connections(source, target, pos_filter=None, server=None, node=None):
         to_query = target
         query_rel = 'PostSyn'
 
-    cn_data = []
-    for q in to_query:
-        r = requests.get('{}/api/node/{}/{}/label/{}?relationships=true'.format(server, node, config.synapses, q))
-
-        # Raise
-        r.raise_for_status()
-
-        # Extract synapses
-        syn = r.json()
+    # Fetch synapses for all bodies in parallel
+    all_syn = utils.run_threaded(_fetch_synapses, to_query, desc='Fetching',
+                                 server=server, node=node)
 
+    cn_data, own_pos, partner_pos = [], [], []
+    for q, syn in zip(to_query, all_syn):
         if not syn:
             continue
 
@@ -1131,56 +1610,61 @@ def get_connections(source, target, pos_filter=None, server=None, node=None):
                     r['To']] + [s['Prop'].get(p, None) for p in props]
                     for s in syn if s['Kind'] == query_rel and s['Rels'] for r in s['Rels']]
 
+        if not this_cn:
+            continue
+
+        # Keep positions as arrays alongside the table -> this way we don't
+        # have to stack the object columns again later
+        own_pos.append(np.array([c[0] for c in this_cn], dtype=np.int64))
+        partner_pos.append(np.array([c[1] for c in this_cn], dtype=np.int64))
+
         df = pd.DataFrame(this_cn)
 
         # Add columns
         if query_rel == 'PreSyn':
             df.columns=['tbar_position', 'psd_position'] + props
             # If we queried sources, we now the identity of presynaptic neuron
-            df['bodyid_pre'] = q
+            df['bodyid_pre'] = int(q)
         else:
             df.columns=['psd_position', 'tbar_position'] + props
+            # Likewise, if we queried targets we know the postsynaptic neuron
+            # -> only one side needs to be looked up via /labels
+            df['bodyid_post'] = int(q)
 
         cn_data.append(df)
 
     cn_data = pd.concat(cn_data, axis=0, sort=True)
 
+    if query_rel == 'PreSyn':
+        tbar_pos, psd_pos = np.concatenate(own_pos), np.concatenate(partner_pos)
+    else:
+        tbar_pos, psd_pos = np.concatenate(partner_pos), np.concatenate(own_pos)
+
     if pos_filter:
         # Get filter
-        filtered = pos_filter(np.vstack(cn_data.tbar_position.values))
+        filtered = np.asarray(pos_filter(tbar_pos), dtype=bool)
 
-        if not any(filtered):
+        if not np.any(filtered):
             raise ValueError('No synapses left after filtering.')
 
         # Filter synapses
         cn_data = cn_data.loc[filtered, :]
+        tbar_pos, psd_pos = tbar_pos[filtered], psd_pos[filtered]
 
     # Add body positions
     if 'bodyid_pre' not in cn_data.columns:
-        # Get positions of PSDs
-        pos = np.vstack(cn_data.tbar_position.values)
-
-        # Get postsynaptic body IDs
-        bodies = requests.request('GET',
-                                  url="{}/api/node/{}/{}/labels".format(server,
-                                                                        node,
-                                                                        config.segmentation),
-                                  json=pos.tolist()).json()
+        # Get presynaptic body IDs
+        bodies = get_multiple_bodyids(tbar_pos, server=server, node=node)
         cn_data['bodyid_pre'] = bodies
 
         # Filter to sources of interest
-        cn_data = cn_data[cn_data.bodyid_pre.isin(source)]
+        is_source = cn_data.bodyid_pre.isin(source).values
+        cn_data = cn_data[is_source]
+        psd_pos = psd_pos[is_source]
 
     if 'bodyid_post' not in cn_data.columns:
-        # Get positions of PSDs
-        pos = np.vstack(cn_data.psd_position.values)
-
         # Get postsynaptic body IDs
-        bodies = requests.request('GET',
-                                  url="{}/api/node/{}/{}/labels".format(server,
-                                                                        node,
-                                                                        config.segmentation),
-                                  json=pos.tolist()).json()
+        bodies = get_multiple_bodyids(psd_pos, server=server, node=node)
         cn_data['bodyid_post'] = bodies
 
         # Filter to targets of interest
@@ -1190,7 +1674,8 @@ def get_connections(source, target, pos_filter=None, server=None, node=None):
 
 
 def get_connectivity(bodyid, pos_filter=None, ignore_autapses=True,
-                     server=None, node=None):
+                     server=None, node=None, bbox=None, partner_filter=None,
+                     use_cache=False, max_workers=16):
     """ Returns connectivity table for given body.
 
     Parameters
@@ -1206,6 +1691,23 @@ def get_connectivity(bodyid, pos_filter=None, ignore_autapses=True,
                         If not provided, will try reading from global.
     node :              str, optional
                         If not provided, will try reading from global.
+    bbox :              list | None, optional
+                        Bounding box to which to restrict the query to.
+                        Only synapses within the bounding box are fetched
+                        from the server. Use ``pos_filter`` for
+                        non-rectangular filters.
+                        Format: ``[x_min, x_max, y_min, y_max, z_min, z_max]``.
+    partner_filter :    iterable, optional
+                        Body IDs of partners. If provided, will only return
+                        connections to these partners.
+    use_cache :         bool, optional
+                        If True, will keep connectivity in memory and re-use
+                        it on subsequent calls for the same body. Ignored
+                        if ``pos_filter`` is given. Use
+                        ``dvidtools.clear_cache`` to reset.
+    max_workers :       int, optional
+                        Max number of parallel requests to the server if
+                        ``bodyid`` is a list.
 
     Returns
     -------
@@ -1214,101 +1716,159 @@ def get_connectivity(bodyid, pos_filter=None, ignore_autapses=True,
     """
 
     if isinstance(bodyid, (list, np.ndarray)):
-        bodyid = np.array(bodyid).astype(str)
+        # Resolve settings only once for all bodies
+        server, node, user = eval_param(server, node)
 
-        cn = [get_connectivity(b, pos_filter=pos_filter,
-                               ignore_autapses=ignore_autapses,
-                               server=server, node=node) for b in tqdm(bodyid)]
+        bodyid = np.array(bodyid).astype(str)
 
-        # Concatenate the DataFrames
+        cn = utils.run_threaded(get_connectivity, bodyid,
+                                max_workers=max_workers,
+                                desc='Fetching',
+                                pos_filter=pos_filter,
+                                ignore_autapses=ignore_autapses,
+                                bbox=bbox, partner_filter=partner_filter,
+                                use_cache=use_cache,
+                                server=server, node=node)
+
+        # Build each relation's table from a dict of Series -> partner IDs
+        # are aligned in a single pass
         conc = []
         for r in ['upstream', 'downstream']:
-            this_r = [d[d.relation==r].set_index('bodyid').drop('relation', axis=1) for d in cn]
-            this_r = pd.concat(this_r, axis=1)
-            this_r.columns = bodyid
-            this_r['relation'] = r
-            this_r = this_r[np.append('relation', bodyid)]
+            series = {}
+            for b, d in zip(bodyid, cn):
+                this_d = d[d.relation == r]
+                series[b] = pd.Series(this_d.n_synapses.values,
+                                      index=this_d.bodyid.values)
+            this_r = pd.DataFrame(series, columns=bodyid)
+            this_r.index.name = 'bodyid'
+            this_r.insert(0, 'relation', r)
             conc.append(this_r.reset_index(drop=False))
 
         cn = pd.concat(conc, axis=0).reset_index(drop=True)
-        cn = cn.fillna(0)
+        cn['relation'] = pd.Categorical(cn.relation,
+                                        categories=['downstream', 'upstream'])
+        cn[bodyid] = cn[bodyid].fillna(0).astype(int)
         cn['total'] = cn[bodyid].sum(axis=1)
         return cn.sort_values(['relation', 'total'], ascending=False).reset_index(drop=True)
 
     server, node, user = eval_param(server, node)
 
-    bodyid = utils.parse_bid(bodyid)
+    bodyid = int(utils.parse_bid(bodyid))
+
+    src, dst, weight = _get_connectivity_coo(bodyid, pos_filter=pos_filter,
+                                             ignore_autapses=ignore_autapses,
+                                             bbox=bbox,
+                                             partner_filter=partner_filter,
+                                             use_cache=use_cache,
+                                             server=server, node=node)
+
+    # Autapses are both down- and upstream
+    down, up = src == bodyid, dst == bodyid
+    relation = pd.Categorical.from_codes(np.repeat([0, 1], [down.sum(), up.sum()]),
+                                         categories=['downstream', 'upstream'])
+    cn_table = pd.DataFrame({'bodyid': np.concatenate([dst[down], src[up]]),
+                             'relation': relation,
+                             'n_synapses': np.concatenate([weight[down],
+                                                           weight[up]])})
+    cn_table.sort_values(['relation', 'n_synapses'], inplace=True, ascending=False)
+    cn_table.reset_index(drop=True, inplace=True)
 
-    # Get synapses
-    r = requests.get('{}/api/node/{}/{}/label/{}?relationships=true'.format(server, node, config.synapses, bodyid))
+    return cn_table[['bodyid', 'relation', 'n_synapses']]
 
-    # Raise
-    r.raise_for_status()
 
-    syn = r.json()
+def _get_connectivity_coo(bodyid, pos_filter=None, ignore_autapses=True,
+                          bbox=None, partner_filter=None, use_cache=False,
+                          server=None, node=None):
+    """ Get connectivity of a single body as edge list.
+
+    Parses the synapses straight into arrays without going through a
+    DataFrame. Expects ``server`` and ``node`` to be already resolved.
+    If ``use_cache=True`` results are cached in memory unless a
+    ``pos_filter`` is given.
+
+    Returns
+    -------
+    src :       numpy.ndarray
+                Body IDs of presynaptic partners.
+    dst :       numpy.ndarray
+                Body IDs of postsynaptic partners.
+    weight :    numpy.ndarray
+                Number of synapses for each ``src`` -> ``dst`` edge.
+
+    """
+    bodyid = int(bodyid)
+
+    if not isinstance(partner_filter, type(None)):
+        src, dst, weight = _get_connectivity_coo(bodyid,
+                                                 pos_filter=pos_filter,
+                                                 ignore_autapses=ignore_autapses,
+                                                 bbox=bbox,
+                                                 use_cache=use_cache,
+                                                 server=server, node=node)
+        partners = np.where(src == bodyid, dst, src)
+        keep = np.isin(partners, np.asarray(partner_filter, dtype=np.int64))
+        return src[keep], dst[keep], weight[keep]
+
+    if use_cache and not pos_filter:
+        if not isinstance(bbox, type(None)):
+            bbox = tuple(np.asarray(bbox, dtype=np.int64).ravel().tolist())
+        return _get_connectivity_coo_cached(bodyid, ignore_autapses, bbox,
+                                            server, node)
+
+    # Get synapses
+    syn = _fetch_synapses(bodyid, bbox=bbox, server=server, node=node)
 
     if pos_filter:
         # Get filter
-        filtered = pos_filter(np.array([s['Pos'] for s in syn]))
-
-        if not any(filtered):
-            pass
-            #raise ValueError('No synapses left after filtering.')
+        filtered = pos_filter(_get_positions(syn))
 
         # Filter synapses
-        syn = np.array(syn)[filtered]
-
-    # Collect positions and query the body IDs of pre-/postsynaptic neurons
-    pos = [cn['To'] for s in syn for cn in s['Rels']]
-    bodies = requests.request('GET',
-                              url="{}/api/node/{}/{}/labels".format(server,
-                                                                    node,
-                                                                    config.segmentation),
-                              json=pos).json()
-
-    # Compile connector table by counting # of synapses between neurons
-    connections = {'PreSynTo': {}, 'PostSynTo': {}}
-    i = 0
-    for s in syn:
-        # Connections point to positions -> we have to map this to body IDs
-        for k, cn in enumerate(s['Rels']):
-            b = bodies[i+k]
-            connections[cn['Rel']][b] = connections[cn['Rel']].get(b, 0) + 1
-        i += k + 1
-
-    if connections['PreSynTo']:
-        # Generate connection table
-        pre = pd.DataFrame.from_dict(connections['PreSynTo'], orient='index')
-        pre.columns = ['n_synapses']
-        pre['relation'] = 'downstream'
-    else:
-        pre = pd.DataFrame([], columns=['n_synapses', 'relation'])
-        pre.index = pre.index.astype(np.int64)
-    pre.index.name = 'bodyid'
-
-    if connections['PostSynTo']:
-        post = pd.DataFrame.from_dict(connections['PostSynTo'], orient='index')
-        post.columns = ['n_synapses']
-        post['relation'] = 'upstream'
-    else:
-        post = pd.DataFrame([], columns=['n_synapses', 'relation'])
-        post.index = post.index.astype(np.int64)
-    post.index.name = 'bodyid'
+        syn = [s for s, keep in zip(syn, filtered) if keep]
 
-    # Combine up- and downstream
-    cn_table = pd.concat([pre.reset_index(), post.reset_index()], axis=0)
-    cn_table.sort_values(['relation', 'n_synapses'], inplace=True, ascending=False)
-    cn_table.reset_index(drop=True, inplace=True)
+    # Collect relations: we only care about pre- and postsynaptic partners
+    rels = [cn for s in syn for cn in s['Rels']
+            if cn['Rel'] in ('PreSynTo', 'PostSynTo')]
+    is_pre = np.fromiter((cn['Rel'] == 'PreSynTo' for cn in rels),
+                         dtype=bool, count=len(rels))
 
-    if ignore_autapses:
-        to_drop = cn_table.index[cn_table.bodyid==int(bodyid)]
-        cn_table = cn_table.drop(index=to_drop).reset_index()
+    # Flatten partner positions straight into an array
+    pos = np.fromiter(itertools.chain.from_iterable(cn['To'] for cn in rels),
+                      dtype=np.int64, count=len(rels) * 3).reshape(-1, 3)
 
-    return cn_table[['bodyid', 'relation', 'n_synapses']]
+    # Query the body IDs of pre-/postsynaptic neurons
+    partners = get_multiple_bodyids(pos, server=server, node=node)
+
+    # Autapses show up on both the pre- and the postsynaptic side -> only
+    # count them once
+    is_autapse = partners == bodyid
+    keep = ~is_autapse if ignore_autapses else is_pre | ~is_autapse
+
+    src = np.where(is_pre, bodyid, partners)[keep]
+    dst = np.where(is_pre, partners, bodyid)[keep]
+
+    # Count synapses per edge
+    edges, weight = np.unique(np.stack([src, dst], axis=1), axis=0,
+                              return_counts=True)
+
+    return edges[:, 0], edges[:, 1], weight
+
+
+@functools.lru_cache(maxsize=1024)
+def _get_connectivity_coo_cached(bodyid, ignore_autapses, bbox, server, node):
+    """ Cached connectivity edge list of a single body."""
+    coo = _get_connectivity_coo(bodyid, ignore_autapses=ignore_autapses,
+                                bbox=bbox, server=server, node=node)
+
+    # Make sure the cached arrays aren't modified in place
+    for a in coo:
+        a.setflags(write=False)
+
+    return coo
 
 
 def get_adjacency(sources, targets=None, pos_filter=None, ignore_autapses=True,
-                  server=None, node=None):
+                  server=None, node=None, sparse=False, dtype=np.int32,
+                  use_cache=False, max_workers=16):
     """ Get adjacency between sources and targets.
 
     Parameters
@@ -1320,54 +1880,194 @@ def get_adjacency(sources, targets=None, pos_filter=None, ignore_autapses=True,
     pos_filter :    function, optional
                     Function to filter synapses by position. Must accept numpy
                     array (N, 3) and return array of [True, False, ...]
+    ignore_autapses : bool, optional
+                    If True, will ignore autapses.
     server :        str, optional
                     If not provided, will try reading from global.
     node :          str, optional
                     If not provided, will try reading from global.
+    sparse :        bool, optional
+                    If True, will return a sparse DataFrame which only stores
+                    non-zero edges. Use this for large sets of sources and
+                    targets. ``adj.sparse.to_coo().tocsr()`` gets you a
+                    ``scipy.sparse.csr_matrix`` for downstream computations.
+    dtype :         numpy dtype, optional
+                    Data type of the adjacency matrix. Use a narrower type
+                    (e.g. ``np.int16``) to save memory for large matrices.
+                    Raises a ValueError if synapse counts don't fit.
+    use_cache :     bool, optional
+                    If True, will keep connectivity of each body in memory
+                    and re-use it on subsequent calls. Ignored if
+                    ``pos_filter`` is given. Use ``dvidtools.clear_cache``
+                    to reset.
+    max_workers :   int, optional
+                    Max number of parallel requests to the server.
 
     Returns
     -------
     adjacency matrix :  pandas.DataFrame
-                        Sources = rows; targets = columns
+                        Sources = rows; targets = columns. Note that a dense
+                        matrix needs ``len(sources) * len(targets)`` cells -
+                        use ``sparse=True`` or :func:`get_edges` if you only
+                        care about the actually connected pairs.
+    """
+
+    server, node, user = eval_param(server, node)
+
+    source_ids, target_ids = _parse_adjacency_ids(sources, targets)
+
+    src, dst, weight = _connectivity_edges(source_ids, target_ids,
+                                           pos_filter=pos_filter,
+                                           ignore_autapses=ignore_autapses,
+                                           use_cache=use_cache,
+                                           max_workers=max_workers,
+                                           server=server, node=node)
+
+    # Map IDs to row (sources) and column (targets) positions
+    rows, cols = source_ids.get_indexer(src), target_ids.get_indexer(dst)
+
+    # Only now turn IDs into (string) labels
+    sources, targets = source_ids.astype(str), target_ids.astype(str)
+
+    dtype = np.dtype(dtype)
+    if dtype.kind in 'iu' and weight.size and weight.max() > np.iinfo(dtype).max:
+        raise ValueError('Synapse counts of up to {} do not fit into '
+                         'dtype "{}"'.format(weight.max(), dtype))
+
+    if sparse:
+        # Build sparse matrix directly from edges -> skips dense allocation
+        mat = scipy.sparse.coo_matrix((weight.astype(dtype), (rows, cols)),
+                                      shape=(len(sources), len(targets))).tocsr()
+        cn = pd.DataFrame.sparse.from_spmatrix(mat, index=sources,
+                                               columns=targets)
+        # Make sure missing edges are 0 (float matrices default to NaN)
+        cn = cn.astype(pd.SparseDtype(dtype, 0))
+    else:
+        # Scatter edges into the dense matrix. Edges are unique (counted per
+        # body and only kept from the queried side), so we can simply assign
+        mat = np.zeros((len(sources), len(targets)), dtype=dtype)
+        mat[rows, cols] = weight
+
+        cn = pd.DataFrame(mat, index=sources, columns=targets)
+
+    cn.index.name = 'bodyid'
+
+    return cn
+
+
+def get_edges(sources, targets=None, pos_filter=None, ignore_autapses=True,
+              server=None, node=None, use_cache=False, max_workers=16):
+    """ Get edges between sources and targets.
+
+    Unlike :func:`get_adjacency` this only returns connected pairs, i.e.
+    memory scales with the number of edges instead of with
+    ``len(sources) * len(targets)``.
+
+    Parameters
+    ----------
+    sources :       iterable
+                    Body IDs of sources.
+    targets :       iterable, optional
+                    Body IDs of targets. If not provided, targets = sources.
+    pos_filter :    function, optional
+                    Function to filter synapses by position. Must accept numpy
+                    array (N, 3) and return array of [True, False, ...]
+    ignore_autapses : bool, optional
+                    If True, will ignore autapses.
+    server :        str, optional
+                    If not provided, will try reading from global.
+    node :          str, optional
+                    If not provided, will try reading from global.
+    use_cache :     bool, optional
+                    If True, will keep connectivity of each body in memory
+                    and re-use it on subsequent calls. Ignored if
+                    ``pos_filter`` is given. Use ``dvidtools.clear_cache``
+                    to reset.
+    max_workers :   int, optional
+                    Max number of parallel requests to the server.
+
+    Returns
+    -------
+    edges :         pandas.DataFrame
+                    Edge list with columns "source", "target" and "weight"
+                    (number of synapses).
     """
 
     server, node, user = eval_param(server, node)
 
-    if not isinstance(sources, (list, tuple, np.ndarray)):
-        sources = [sources]
+    source_ids, target_ids = _parse_adjacency_ids(sources, targets)
+
+    src, dst, weight = _connectivity_edges(source_ids, target_ids,
+                                           pos_filter=pos_filter,
+                                           ignore_autapses=ignore_autapses,
+                                           use_cache=use_cache,
+                                           max_workers=max_workers,
+                                           server=server, node=node)
+
+    return pd.DataFrame({'source': src, 'target': dst, 'weight': weight})
+
+
+def _parse_adjacency_ids(sources, targets):
+    """ Turn sources and targets into indices of unique integer body IDs.
+
+    Keeps order. Index objects map IDs to row/column positions via a hash
+    table.
+    """
+    # This also works for single IDs and pandas Series/Index
+    sources = np.atleast_1d(np.asarray(sources))
+    targets = sources if targets is None else np.atleast_1d(np.asarray(targets))
+
+    source_ids = pd.Index(pd.unique(sources.astype(np.int64)))
+    target_ids = pd.Index(pd.unique(targets.astype(np.int64)))
+
+    return source_ids, target_ids
+
 
-    if isinstance(targets, type(None)):
-        targets = sources
-    elif not isinstance(targets, (list, tuple, np.ndarray)):
-        targets = [targets]
+def _connectivity_edges(source_ids, target_ids, pos_filter=None,
+                        ignore_autapses=True, use_cache=False, max_workers=16,
+                        server=None, node=None):
+    """ Get edges from sources to targets.
 
-    # Make sure we don't have any duplicates
-    sources = np.array(list(set(sources))).astype(str)
-    targets = np.array(list(set(targets))).astype(str)
+    Expects ``server`` and ``node`` to be already resolved.
+
+    Returns
+    -------
+    src, dst, weight :  numpy.ndarray
+                        Body IDs of source and target, and number of synapses
+                        for each edge. Edges are unique.
+
+    """
+    # Nothing to query
+    if not len(source_ids) or not len(target_ids):
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty.copy(), empty.copy()
 
     # Make sure we query the smaller population from the server
-    if len(targets) <= len(sources):
-        columns, index, relation, to_transpose = targets, sources, 'upstream', False
+    if len(target_ids) <= len(source_ids):
+        to_query, partners, relation = target_ids, source_ids, 'upstream'
     else:
-        columns, index, relation, to_transpose = sources, targets, 'downstream', True
-
-    # Get connectivity
-    cn = get_connectivity(columns, pos_filter=pos_filter,
-                          ignore_autapses=ignore_autapses,
-                          server=server, node=node)
+        to_query, partners, relation = source_ids, target_ids, 'downstream'
 
-    # Subset connectivity to source -> target
-    cn = cn[cn.relation==relation].set_index('bodyid')
-    cn.index = cn.index.astype(str)
-    cn = cn.reindex(index=index, columns=columns, fill_value=0)
+    # Get edges for each body in the smaller population - restricted to
+    # partners in the other population
+    coo = utils.run_threaded(_get_connectivity_coo, to_query.values,
+                             max_workers=max_workers, desc='Fetching',
+                             pos_filter=pos_filter,
+                             ignore_autapses=ignore_autapses,
+                             partner_filter=partners,
+                             use_cache=use_cache,
+                             server=server, node=node)
+    queried = np.repeat(to_query.values, [len(c[0]) for c in coo])
+    src, dst, weight = (np.concatenate(a) for a in zip(*coo))
 
-    if to_transpose:
-        cn = cn.T
+    # Edges between two queried bodies show up twice -> only keep them
+    # from the queried side
+    keep = (dst if relation == 'upstream' else src) == queried
 
-    return cn
+    return src[keep], dst[keep], weight[keep]
 
 
-def snap_to_body(bodyid, positions, server=None, node=None):
+def snap_to_body(bodyid, positions, server=None, node=None, max_workers=8):
     """ Snap a set of positions to the closest voxels on a given body.
 
     Parameters
@@ -1380,6 +2080,8 @@ def snap_to_body(bodyid, positions, server=None, node=None):
                 If not provided, will try reading from global.
     node :      str, optional
                 If not provided, will try reading from global.
+    max_workers : int, optional
+                Max number of coarse voxels to query in parallel.
 
     Returns
     -------
@@ -1389,6 +2091,8 @@ def snap_to_body(bodyid, positions, server=None, node=None):
     # Parse body ID
     bodyid = utils.parse_bid(bodyid)
 
+    server, node, user = eval_param(server, node)
+
     if isinstance(positions, pd.DataFrame):
         positions = positions[['x','y','z']].values
     elif not isinstance(positions, np.ndarray):
@@ -1398,38 +2102,54 @@ def snap_to_body(bodyid, positions, server=None, node=None):
 
     # Find those that are not already within the body
     bids = get_multiple_bodyids(positions, server=server, node=node)
-    mask = np.array(bids) != int(bodyid)
+    mask = bids != int(bodyid)
     to_snap = positions[mask]
 
+    if not to_snap.shape[0]:
+        return positions
+
     # First get voxels of the coarse neuron
     voxels = get_neuron(bodyid, scale='coarse', ret_type='INDEX',
                         server=server, node=node) * 64
 
     # For each position find a corresponding coarse voxel
-    dist = cdist(to_snap, voxels)
-    closest = voxels[np.argmin(dist, axis=1)]
+    _, ix = cKDTree(voxels).query(to_snap)
+    closest = voxels[ix]
 
-    # Now query the more precise mesh for these coarse voxels
-    snapped = []
-    for v in tqdm(closest, leave=False, desc='Snapping'):
+    # Many positions will map to the same coarse voxel -> query each only once
+    unique, inv = np.unique(closest, axis=0, return_inverse=True)
+
+    def snap_voxel(v):
         # Generate a bounding bbox
-        bbox = np.vstack([v,v]).T
+        bbox = np.vstack([v, v]).T
         bbox[:, 1] += 63
 
         fine = get_neuron(bodyid, scale=0, ret_type='INDEX',
                           bbox=bbox.ravel(),
                           server=server, node=node)
 
-        dist = cdist([v], fine)
+        return fine[np.argmin(cdist(v[np.newaxis], fine), axis=1)][0]
 
-        snapped.append(fine[np.argmin(dist, axis=1)][0])
+    # Now query the more precise mesh for these coarse voxels
+    snapped = utils.run_threaded(snap_voxel, unique,
+                                 max_workers=max_workers,
+                                 desc='Snapping',
+                                 progress=unique.shape[0] > 1)
 
-    positions[mask] = np.vstack(snapped)
+    positions[mask] = np.vstack(snapped)[inv.ravel()]
 
     return positions
 
 
-def get_last_mod(bodyid, server=None, node=None):
+# Last modification info per (bodyid, server, node) -> (timestamp, info).
+# Only filled if ``max_age`` is used and capped at _LAST_MOD_CACHE_SIZE
+# entries (oldest are dropped first)
+_LAST_MOD_CACHE = OrderedDict()
+_LAST_MOD_CACHE_SIZE = 10000
+_LAST_MOD_LOCK = threading.Lock()
+
+
+def get_last_mod(bodyid, server=None, node=None, max_age=None):
     """ Fetches details on the last modification to given body.
 
     Parameters
@@ -1440,6 +2160,9 @@ def get_last_mod(bodyid, server=None, node=None):
                 If not provided, will try reading from global.
     node :      str, optional
                 If not provided, will try reading from global.
+    max_age :   int | float, optional
+                If provided, will re-use info fetched for this body at most
+                ``max_age`` seconds ago instead of asking the server again.
 
     Returns
     -------
@@ -1455,16 +2178,30 @@ def get_last_mod(bodyid, server=None, node=None):
 
     server, node, user = eval_param(server, node)
 
-    r = requests.get('{}/api/node/{}/{}/lastmod/{}'.format(server,
-                                                           node,
-                                                           config.segmentation,
-                                                           bodyid))
+    key = (bodyid, server, node)
+    if max_age:
+        with _LAST_MOD_LOCK:
+            cached = _LAST_MOD_CACHE.get(key)
+        if cached and time.time() - cached[0] <= max_age:
+            return dict(cached[1])
+
+    r = _SESSION.get(_make_url('{}/lastmod/{}', config.segmentation, bodyid,
+                               server=server, node=node))
     r.raise_for_status()
 
-    return r.json()
+    info = _parse_json(r)
+
+    if max_age:
+        with _LAST_MOD_LOCK:
+            _LAST_MOD_CACHE[key] = (time.time(), info)
+            _LAST_MOD_CACHE.move_to_end(key)
+            while len(_LAST_MOD_CACHE) > _LAST_MOD_CACHE_SIZE:
+                _LAST_MOD_CACHE.popitem(last=False)
+
+    return dict(info)
 
 
-def get_skeleton_mutation(bodyid, server=None, node=None):
+def get_skeleton_mutation(bodyid, server=None, node=None, max_workers=16):
     """ Fetches mutation ID of given body.
 
     Parameters
@@ -1475,6 +2212,9 @@ def get_skeleton_mutation(bodyid, server=None, node=None):
                     If not provided, will try reading from global.
     node :          str, optional
                     If not provided, will try reading from global.
+    max_workers :   int, optional
+                    Max number of parallel requests to the server if
+                    ``bodyid`` is a list.
 
     Returns
     -------
@@ -1484,45 +2224,40 @@ def get_skeleton_mutation(bodyid, server=None, node=None):
     """
 
     if isinstance(bodyid, (list, np.ndarray)):
-        resp = {x: get_skeleton_mutation(x,
-                                         server=server,
-                                         node=node) for x in tqdm(bodyid,
-                                                         desc='Loading')}
-        return resp
+        # Resolve settings only once for all bodies
+        server, node, user = eval_param(server, node)
 
-    def split_iter(string):
-        # Returns iterator for line split -> memory efficient
-        # Attention: this will not fetch the last line!
-        return (x.group(0) for x in re.finditer('.*?\n', string))
+        muts = utils.run_threaded(get_skeleton_mutation, bodyid,
+                                  max_workers=max_workers,
+                                  desc='Loading',
+                                  server=server,
+                                  node=node)
+        return dict(zip(bodyid, muts))
 
     bodyid = utils.parse_bid(bodyid)
 
     server, node, user = eval_param(server, node)
 
-    r = requests.get('{}/api/node/{}/{}_skeletons/key/{}_swc'.format(server,
-                                                                     node,
-                                                                     config.segmentation,
-                                                                     bodyid))
+    url = _make_url('{}_skeletons/key/{}_swc', config.segmentation, bodyid,
+                    server=server, node=node)
 
-    if 'not found' in r.text:
-        print(r.text)
-        return None
-
-    # Extract header using a generator -> this way we don't have to iterate
-    # over all lines
-    lines = split_iter(r.text)
+    # Stream the response and stop reading once we are past the header ->
+    # this way we don't have to download and scan the entire SWC
     header = []
-    for l in lines:
-        if l.startswith('#'):
-            header.append(l)
-        else:
-            break
+    with _SESSION.get(url, stream=True) as r:
+        for l in r.iter_lines():
+            if not l.startswith(b'#'):
+                if b'not found' in l:
+                    print(l.decode())
+                    return None
+                break
+            header.append(l.decode())
     # Turn header back into string
     header = '\n'.join(header)
 
     if not 'mutation id' in header:
         print('{} - Unable to check mutation: mutation ID not in SWC header'.format(bodyid))
     else:
-        swc_mut = re.search('"mutation id": (.*?)}', header).group(1)
+        swc_mut = _MUT_ID_RE.search(header).group(1)
         return int(swc_mut)
 
@@ -4,6 +4,7 @@
 import numpy as np
 
 from skimage.measure import marching_cubes_lewiner
+from scipy.ndimage import distance_transform_edt
 from scipy.ndimage.morphology import binary_erosion, binary_fill_holes
 
 
@@ -67,6 +68,28 @@ def remove_surface_voxels(voxels, **kwargs):
     return voxels_erode
 
 
+def get_deepest_voxel(voxels):
+    """ Returns the voxel furthest away from the surface.
+
+    Equivalent to but much faster than eroding surface voxels until only
+    the center is left.
+    """
+
+    # Use bounding boxes to keep matrix small
+    bb_min = voxels.min(axis=0)
+
+    # Generate matrix and pad by one so that voxels at the border of the
+    # bounding box count as surface
+    mat = np.pad(_voxels_to_matrix(voxels - bb_min), pad_width=1,
+                 mode='constant', constant_values=0)
+
+    # Distance of each voxel to the closest background voxel
+    dist = distance_transform_edt(mat)
+
+    # Compensate for padding offset
+    return np.array(np.unravel_index(np.argmax(dist), dist.shape)) - 1 + bb_min
+
+
 def get_surface_voxels(voxels):
     """ Returns surface voxels. """
 
@@ -132,11 +155,11 @@ def _voxels_to_matrix(voxels, fill=False):
 
     #Populate matrix
     if voxels.shape[1] == 4:
-        mat = np.zeros((voxels.max(axis=0) + 1)[[-1, 1, 0]], dtype=np.bool)
+        mat = np.zeros((voxels.max(axis=0) + 1)[[-1, 1, 0]], dtype=bool)
         for col in voxels:
             mat[col[2]:col[3] + 1, col[1], col[0]] = 1
     elif voxels.shape[1] == 3:
-        mat = np.zeros((voxels.max(axis=0) + 1), dtype=np.bool)
+        mat = np.zeros((voxels.max(axis=0) + 1), dtype=bool)
         mat[voxels[:, 0], voxels[:, 1], voxels[:, 2]] = 1
     else:
         raise ValueError('Unexpected voxel shape')
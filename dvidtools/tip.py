@@ -12,8 +12,8 @@ import pandas as pd
 import warnings
 
 from collections import OrderedDict
+from scipy.spatial import cKDTree
 from scipy.spatial.distance import cdist, pdist, squareform
-from tqdm import tqdm
 
 
 def detect_tips(x, use_clf=False, psd_dist=False, done_dist=False,
@@ -115,7 +115,10 @@ def detect_tips(x, use_clf=False, psd_dist=False, done_dist=False,
                          ' check the body ID.')
 
     # Find leaf and root nodes
-    leafs = n[(~n.node_id.isin(n.parent_id.values)) | (n.parent_id <= 0)].copy()
+    node_ids = n.node_id.to_numpy(dtype=np.int64)
+    parent_ids = n.parent_id.to_numpy(dtype=np.int64)
+    is_leaf = ~np.isin(node_ids, parent_ids) | (parent_ids <= 0)
+    leafs = n.iloc[np.flatnonzero(is_leaf)].copy()
 
     # Remove potential duplicated leafs
     if tip_dist:
@@ -146,6 +149,11 @@ def detect_tips(x, use_clf=False, psd_dist=False, done_dist=False,
         leafs = leafs.loc[filtered, :]
 
     n_leafs = leafs.shape[0]
+    leaf_pos = leafs[['x', 'y', 'z']].values
+
+    # Collect tips to drop in a single mask -> tips dropped by one filter
+    # won't be probed by the next and we only subset the table once
+    drop = np.zeros(n_leafs, dtype=bool)
 
     if psd_dist:
         # Get synapses
@@ -153,47 +161,46 @@ def detect_tips(x, use_clf=False, psd_dist=False, done_dist=False,
                                  server=server, node=node)
         post = syn[syn.Kind=='PostSyn']
 
-        # Get distances
-        dist = cdist(leafs[['x', 'y', 'z']].values,
-                     np.vstack(post.Pos.values))
-
-        # Is tip close to PSD?
-        at_psd = np.min(dist, axis=1) < psd_dist
+        if not post.empty:
+            # Get distance to the closest PSD (infinite if none within
+            # psd_dist) without calculating the full distance matrix
+            tree = cKDTree(np.vstack(post.Pos.values))
+            dist, _ = tree.query(leaf_pos, distance_upper_bound=psd_dist)
 
-        leafs = leafs.loc[~at_psd]
+            # Is tip close to PSD?
+            drop |= dist < psd_dist
 
-    psd_filtered = n_leafs - leafs.shape[0]
+    psd_filtered = int(drop.sum())
 
     if done_dist:
-        # Check for DONE tags in vicinity
-        at_done = []
-        for pos in tqdm(leafs[['x', 'y', 'z']].values,
-                        desc='Check DONE', leave=False):
+        def has_done_tag(pos):
             # We are cheating here b/c we don't actually calculate the
             # distance!
             labels = fetch.get_labels_in_area(pos - done_dist/2,
                                               [done_dist] * 3,
+                                              return_type='records',
                                               server=server, node=node)
 
             if isinstance(labels, type(None)):
-                at_done.append(False)
-                continue
+                return False
 
             # DONE tags have no "action" and "checked" = 1
-            if any([p.get('checked', False) and not p.get('action', False) for p in labels.Prop.values]):
-                at_done.append(True)
-            else:
-                at_done.append(False)
+            return any([l['Prop'].get('checked', False) and not l['Prop'].get('action', False)
+                        for l in labels])
+
+        # Check for DONE tags in vicinity
+        at_done = np.zeros(n_leafs, dtype=bool)
+        at_done[~drop] = utils.run_threaded(has_done_tag,
+                                            leaf_pos[~drop],
+                                            desc='Check DONE',
+                                            leave=False)
 
-        leafs = leafs.loc[~np.array(at_done, dtype=bool)]
+        drop |= at_done
 
-    done_filtered = n_leafs - leafs.shape[0]
+    done_filtered = int(drop.sum())
 
     if checked_dist:
-        # Check if position has been "Set Checked" in the past
-        checked = []
-        for pos in tqdm(leafs[['x', 'y', 'z']].values,
-                        desc='Test Checked', leave=False):
+        def was_checked(pos):
             # We will look for the assigment in a small window in case the
             # tip has moved slightly between iterations
             ass = fetch.get_assignment_status(pos, window=[checked_dist]*3,
@@ -201,17 +208,21 @@ def detect_tips(x, use_clf=False, psd_dist=False, done_dist=False,
                                               server=server,
                                               node=node)
 
-            if any([l.get('checked', False) for l in ass]):
-                checked.append(True)
-            else:
-                checked.append(False)
+            return any([l.get('checked', False) for l in ass])
+
+        # Check if position has been "Set Checked" in the past
+        checked = np.zeros(n_leafs, dtype=bool)
+        checked[~drop] = utils.run_threaded(was_checked,
+                                            leaf_pos[~drop],
+                                            desc='Test Checked',
+                                            leave=False)
 
-        leafs = leafs.loc[~np.array(checked, dtype=bool)]
+        drop |= checked
 
-    checked_filtered = n_leafs - leafs.shape[0]
+    checked_filtered = int(drop.sum())
 
-    # Make a copy before we wrap up to prevent any data-on-copy warning
-    leafs = leafs.copy()
+    # Drop filtered tips and make a copy to prevent any data-on-copy warning
+    leafs = leafs.loc[~drop].copy()
 
     # Assuming larger radii indicate more likely continuations
     leafs.sort_values('radius', ascending=False, inplace=True)
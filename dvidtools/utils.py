@@ -7,11 +7,23 @@ import json
 import networkx as nx
 import pandas as pd
 import numpy as np
-import re
+import threading
 
-from io import StringIO
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from io import BytesIO, StringIO
 from itertools import combinations
+from scipy.spatial import cKDTree
 from scipy.spatial.distance import pdist, cdist, squareform
+from tqdm import tqdm
+
+# Max number of worker threads running at the same time across all
+# (concurrent) calls to ``run_threaded``. This is also the size of the
+# connection pool of the default session (see ``dvidtools.fetch``)
+_MAX_THREADS = 64
+_THREAD_SLOTS = threading.BoundedSemaphore(_MAX_THREADS)
+
+# Flags threads that are running work for ``run_threaded``
+_THREAD_STATE = threading.local()
 
 
 def swc_to_graph(x):
@@ -261,39 +273,52 @@ def parse_swc_str(x):
 
     Parameters
     ----------
-    x :     str
+    x :     str | bytes | file-like
+            Bytes (e.g. the raw content of a server response) are parsed
+            without decoding the whole SWC to str first.
 
     Returns
     -------
     pandas.DataFrame, header
 
     """
-    def split_iter(string):
-        # Returns iterator for line split -> memory efficient
-        # Attention: this will not fetch the last line!
-        return (x.group(0) for x in re.finditer('.*?\n', string))
-
-    if not isinstance(x, str):
-        raise TypeError('x must be str, got "{}"'.format(type(x)))
-
-    # Extract header using a generator -> this way we don't have to iterate
-    # over all lines
-    lines = split_iter(x)
-    header = []
-    for l in lines:
-        if l.startswith('#'):
-            header.append(l)
-        else:
+    if hasattr(x, 'read'):
+        x = x.read()
+
+    if isinstance(x, bytes):
+        buffer, comment = BytesIO(x), b'#'
+    elif isinstance(x, str):
+        buffer, comment = StringIO(x), '#'
+    else:
+        raise TypeError('x must be str or bytes, got "{}"'.format(type(x)))
+
+    # Extract header by iterating lines lazily -> this way we don't have to
+    # iterate over all lines
+    offset = 0
+    for l in buffer:
+        if not l.startswith(comment):
             break
+        offset += len(l)
 
-    # Turn header back into string
-    header = ''.join(header)
+    # Turn header into string
+    header = x[:offset]
+    if isinstance(header, bytes):
+        header = header.decode()
 
-    # Turn SWC into a DataFrame
-    f = StringIO(x)
-    df = pd.read_csv(f, delim_whitespace=True, header=None, comment='#')
+    # Parse the whitespace-separated table in one go - this also drops any
+    # remaining (including inline) comments
+    body = x[offset:]
+    body = BytesIO(body) if isinstance(body, bytes) else StringIO(body)
+    data = np.loadtxt(body, comments='#', ndmin=2)
 
-    df.columns = ['node_id', 'label', 'x', 'y', 'z', 'radius', 'parent_id']
+    # Turn SWC into a DataFrame
+    df = pd.DataFrame({'node_id': data[:, 0].astype(np.int64),
+                       'label': data[:, 1].astype(np.int64),
+                       'x': data[:, 2],
+                       'y': data[:, 3],
+                       'z': data[:, 4],
+                       'radius': data[:, 5],
+                       'parent_id': data[:, 6].astype(np.int64)})
 
     return df, header
 
@@ -381,30 +406,98 @@ def parse_bid(x):
         raise ValueError('Unable to coerce "{}" into numeric body ID'.format(x))
 
 
+def run_threaded(func, items, max_workers=16, desc=None, progress=True,
+                 leave=True, **kwargs):
+    """ Run ``func(item, **kwargs)`` for each item using a pool of threads.
+
+    Requests are I/O-bound and release the GIL while waiting for the server,
+    so this lets us have multiple requests in flight at the same time.
+
+    Nested calls (e.g. ``get_multiple_bodyids`` inside a threaded
+    ``get_connectivity``) run serially in the calling worker thread instead
+    of starting another pool. Together with a module-level semaphore this
+    keeps the number of threads making requests at or below the size of the
+    session's connection pool.
+
+    Parameters
+    ----------
+    func :          callable
+                    Function to run. Must accept an item as first argument.
+    items :         list | numpy.ndarray
+                    Items to run ``func`` for.
+    max_workers :   int, optional
+                    Max number of threads.
+    desc :          str, optional
+                    Description for the progress bar.
+    progress :      bool, optional
+                    If False, will not show a progress bar.
+    leave :         bool, optional
+                    If False, will remove the progress bar once finished.
+    **kwargs
+                    Keyword arguments are passed through to ``func``.
+
+    Returns
+    -------
+    list
+                    Results in the same order as ``items``.
+    """
+    # No need to spin up threads for a single item or if we already are
+    # in a worker thread
+    if len(items) <= 1 or getattr(_THREAD_STATE, 'is_worker', False):
+        return [func(i, **kwargs) for i in items]
+
+    def run(i):
+        with _THREAD_SLOTS:
+            _THREAD_STATE.is_worker = True
+            try:
+                return func(i, **kwargs)
+            finally:
+                _THREAD_STATE.is_worker = False
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(run, i): k for k, i in enumerate(items)}
+
+        # Update progress as requests finish (not in order of submission)
+        results = [None] * len(futures)
+        for f in tqdm(as_completed(futures),
+                      total=len(futures),
+                      desc=desc,
+                      leave=leave,
+                      disable=not progress):
+            results[futures[f]] = f.result()
+
+    return results
+
+
 def _snap_to_skeleton(x, pos):
-    """ Snaps position to closest node.
+    """ Snaps position(s) to closest node.
 
     Parameters
     ----------
     x :     pandas.DataFrame
             SWC DataFrame.
     pos :   array-like
-            x/y/z position.
+            x/y/z position or (N, 3) array of positions.
 
     Returns
     -------
-    node ID :       int
+    node ID :       int | numpy.ndarray
+                    Array of node IDs if multiple positions.
     """
 
     if not isinstance(x, pd.DataFrame):
         raise TypeError('x must be pandas DataFrame, got "{}"'.format(type(x)))
 
-    if not isinstance(pos, np.ndarray):
-        pos = np.array(pos)
+    pos = np.asarray(pos)
+
+    if pos.ndim == 1:
+        dist = np.sum((x[['x', 'y', 'z']].values - pos)**2, axis=1)
+        return int(x.node_id.values[np.argmin(dist)])
 
-    dist = np.sum((x[['x', 'y', 'z']].values - pos)**2, axis=1)
+    tree = cKDTree(x[['x', 'y', 'z']].values)
+    _, ix = tree.query(pos)
 
-    return x.iloc[np.argmin(dist)].node_id.astype(int)
+    return x.node_id.values[ix].astype(int)
 
 
 def check_skeleton(bodyid, sample=False, node=None, server=None):
@@ -45,7 +45,7 @@ setup(
     ],
     install_requires=requirements,
     python_requires='>=3.5',
-    extras_require={'extras': ['scikit-learn==0.20.3']},
+    extras_require={'extras': ['scikit-learn==0.20.3', 'orjson']},
     include_package_data=True,
     zip_safe=False
 )
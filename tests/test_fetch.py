@@ -0,0 +1,32 @@
+import os
+
+from unittest import mock
+
+import dvidtools as dt
+
+from dvidtools import fetch
+from dvidtools import utils
+
+SWC = (b'# {"mutation id": 1}\n'
+       b'1 0 0 0 0 1 -1\n'
+       b'2 0 10 0 0 1 1\n'
+       b'3 0 20 0 0 1 2\n')
+
+
+def test_get_skeleton_soma_save_to(tmp_path):
+    resp = mock.Mock(content=SWC)
+    with mock.patch.object(fetch, '_cached_get', return_value=resp), \
+         mock.patch.object(utils, 'refurbish_table',
+                           wraps=utils.refurbish_table) as refurbish:
+        assert dt.get_skeleton(1, save_to=str(tmp_path), soma=(20, 0, 0),
+                               check_mutation=False, server='http://dvid',
+                               node='abc')
+
+    # Soma-only rerooting must still clean up the table before saving
+    assert refurbish.called
+
+    df, _ = utils.parse_swc_str(open(os.path.join(tmp_path, '1.swc')).read())
+    root = df[df.parent_id < 0]
+    assert len(root) == 1
+    assert root.label.iloc[0] == 1
+    assert tuple(root[['x', 'y', 'z']].values[0]) == (20, 0, 0)
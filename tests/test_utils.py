@@ -0,0 +1,21 @@
+import pytest
+
+from dvidtools import utils
+
+SWC = ('# {"mutation id": 1}\n'
+       '1 0 0 0 0 1 -1  # root\n'
+       '# intermittent comment\n'
+       '2 0 10 0 0 1 1\n'
+       '3 1 20.5 0 0 2 2 # soma\n')
+
+
+@pytest.mark.parametrize('swc', [SWC, SWC.encode()])
+def test_parse_swc_str_inline_comments(swc):
+    df, header = utils.parse_swc_str(swc)
+
+    assert header == '# {"mutation id": 1}\n'
+    assert df.node_id.tolist() == [1, 2, 3]
+    assert df.parent_id.tolist() == [-1, 1, 2]
+    assert df.label.tolist() == [0, 0, 1]
+    assert df.x.tolist() == [0, 10, 20.5]
+    assert df.radius.tolist() == [1, 1, 2]